@@ -0,0 +1,74 @@
+"""
+Times calling the manager (data_units(token)) end to end on typical log tokens, and a manager with the suffix sets
+(DataUnitManager(suffix_sets=SUFFIX_SETS)) on tokens with rates.
+
+To compare with another checkout (the commit before a change for example), pass its path, the same timings are run in
+it and the speedup is shown:
+
+    git worktree add /tmp/before <commit>
+    python benchmarks/bench_call.py /tmp/before
+
+run from the repository root with:
+
+    python benchmarks/bench_call.py
+"""
+import json
+import os
+import subprocess
+import sys
+import timeit
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (manager, token), "suffixes" is the manager with the suffix sets.
+TOKENS = [('data_units', token) for token in
+          ['4096', '4 KB', '512 MiB', '1.5 GB', '-2-Mb', '2Mb', '0.25 megabytes', '3 Megabytes', 12345]]
+TOKENS += [('suffixes', token) for token in ['4 KB', '1.5 gigabytes/sec', '2 MB/s', '12 KiB per second']]
+NUMBER = 10000
+REPEAT = 7
+
+# the timing is run in a child process for each checkout, so the two do not share any imports.
+CHILD = '''
+import json, sys, timeit
+sys.path.insert(0, sys.argv[1])
+from data_unit_calc import data_units, DataUnitManager, SUFFIX_SETS
+managers = {'data_units': data_units, 'suffixes': DataUnitManager(suffix_sets=SUFFIX_SETS)}
+tmp_ret = []
+for name, token in json.loads(sys.argv[2]):
+    manager = managers[name]
+    tmp_ret.append(min(timeit.repeat(lambda: manager(token), number=%d, repeat=%d)) / %d * 1e6)
+print(json.dumps(tmp_ret))
+''' % (NUMBER, REPEAT, NUMBER)
+
+
+def time_tokens(path):
+    return json.loads(subprocess.check_output([sys.executable, '-c', CHILD, path, json.dumps(TOKENS)]))
+
+
+def main(rounds=10):
+    # the checkouts are timed in turns and the fastest of the rounds is kept, to keep the noise out.
+    paths = [ROOT_DIR] + sys.argv[1:2]
+    tmp_times = [None] * len(paths)
+    for index in range(rounds):
+        for path_index, path in enumerate(paths):
+            tmp_round = time_tokens(path)
+            if tmp_times[path_index] is None:
+                tmp_times[path_index] = tmp_round
+            else:
+                tmp_times[path_index] = [min(a, b) for a, b in zip(tmp_times[path_index], tmp_round)]
+
+    after = tmp_times[0]
+    if len(paths) > 1:
+        before = tmp_times[1]
+        print('%-12s %-20s %12s %12s %8s' % ('manager', 'token', 'before (us)', 'after (us)', 'speedup'))
+        for (name, token), before_time, after_time in zip(TOKENS, before, after):
+            print('%-12s %-20r %12.3f %12.3f %7.2fx' % (name, token, before_time, after_time,
+                                                        before_time / after_time))
+    else:
+        print('%-12s %-20s %12s' % ('manager', 'token', 'time (us)'))
+        for (name, token), after_time in zip(TOKENS, after):
+            print('%-12s %-20r %12.3f' % (name, token, after_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,37 @@
+"""
+Compares calling a DataUnitManager with calling a format compiled by DataUnitManager.compile_format, on values that are
+in the format.
+
+run from the repository root with:
+
+    python benchmarks/bench_compile_format.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_unit_calc import DataUnitManager
+from data_unit_lookups import SUFFIX_SETS
+
+FORMATS = [
+    ('<int> KiB', None, '512 KiB'),
+    ('<float><unit>/s', ['KB', 'MB', 'GB'], '1.5MB/s'),
+    ('<float> <unit>', None, '1.5 megabytes'),
+]
+NUMBER = 100000
+
+
+def main():
+    dum = DataUnitManager(suffix_sets=SUFFIX_SETS)
+    print('%-18s %-16s %12s %12s %8s' % ('spec', 'value', 'call (us)', 'format (us)', 'speedup'))
+    for spec, units, value in FORMATS:
+        fmt = dum.compile_format(spec, units=units)
+        before = timeit.timeit(lambda: dum(value), number=NUMBER) / NUMBER * 1e6
+        after = timeit.timeit(lambda: fmt(value), number=NUMBER) / NUMBER * 1e6
+        print('%-18s %-16r %12.3f %12.3f %7.1fx' % (spec, value, before, after, before / after))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Times DataSizeCalculator.convert on conversions with a whole number result and on conversions with a fractional
+result, for int and Decimal values.
+
+To compare with another checkout (the commit before a change for example), pass its path, the same timings are run in
+it and the speedup is shown:
+
+    git worktree add /tmp/before <commit>
+    python benchmarks/bench_convert.py /tmp/before
+
+run from the repository root with:
+
+    python benchmarks/bench_convert.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (name, value, from unit, to unit), the values are passed as strings and made into ints or Decimals in the child.
+CONVERSIONS = [
+    ('int, whole', '1234', 'KB', 'b'),
+    ('int, fraction', '1234', 'MiB', 'KB'),
+    ('Decimal, whole', '1.5', 'GB', 'MB'),
+    ('Decimal, fraction', '12.34', 'MiB', 'KB'),
+    ('int, large binary', '3', 'YiB', 'PB'),
+]
+NUMBER = 20000
+REPEAT = 7
+
+# the timing is run in a child process for each checkout, so the two do not share any imports.
+CHILD = '''
+import json, sys, timeit
+from decimal import Decimal
+sys.path.insert(0, sys.argv[1])
+from data_unit_calc import data_size_calculator
+convert = data_size_calculator.convert
+tmp_ret = []
+for name, value, from_unit, to_unit in json.loads(sys.argv[2]):
+    value = int(value) if value.isdigit() else Decimal(value)
+    tmp_ret.append(min(timeit.repeat(lambda: convert(value, from_unit, to_unit), number=%d, repeat=%d)) / %d * 1e6)
+print(json.dumps(tmp_ret))
+''' % (NUMBER, REPEAT, NUMBER)
+
+
+def time_conversions(path):
+    return json.loads(subprocess.check_output([sys.executable, '-c', CHILD, path, json.dumps(CONVERSIONS)]))
+
+
+def main(rounds=10):
+    # the checkouts are timed in turns and the fastest of the rounds is kept, to keep the noise out.
+    paths = [ROOT_DIR] + sys.argv[1:2]
+    tmp_times = [None] * len(paths)
+    for index in range(rounds):
+        for path_index, path in enumerate(paths):
+            tmp_round = time_conversions(path)
+            if tmp_times[path_index] is None:
+                tmp_times[path_index] = tmp_round
+            else:
+                tmp_times[path_index] = [min(a, b) for a, b in zip(tmp_times[path_index], tmp_round)]
+
+    after = tmp_times[0]
+    if len(paths) > 1:
+        before = tmp_times[1]
+        print('%-20s %12s %12s %8s' % ('conversion', 'before (us)', 'after (us)', 'speedup'))
+        for conversion, before_time, after_time in zip(CONVERSIONS, before, after):
+            print('%-20s %12.3f %12.3f %7.2fx' % (conversion[0], before_time, after_time, before_time / after_time))
+    else:
+        print('%-20s %12s' % ('conversion', 'time (us)'))
+        for conversion, after_time in zip(CONVERSIONS, after):
+            print('%-20s %12.3f' % (conversion[0], after_time))
+
+
+if __name__ == '__main__':
+    main()
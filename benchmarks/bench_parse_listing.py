@@ -0,0 +1,54 @@
+"""
+Compares DataUnitManager.parse_listing on a 'du -h' style listing with just splitting the lines, and with parsing the
+same column through a force_non_specific manager (parse_many).
+
+run from the repository root with:
+
+    python benchmarks/bench_parse_listing.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_unit_calc import data_units, DataUnitManager
+from data_unit_lookups import BIN_BYT
+
+LINES = 1000000
+
+
+def make_listing(count):
+    tmp_random = random.Random(1)
+    tmp_ret = []
+    for index in range(count):
+        tmp_size = tmp_random.choice(['%.1f%s' % (tmp_random.random() * 10, tmp_random.choice('KMGT')),
+                                      '%d%s' % (tmp_random.randint(10, 999), tmp_random.choice('KMG')),
+                                      str(tmp_random.randint(0, 4096))])
+        tmp_ret.append('%s\t./dir_%d/file_%d\n' % (tmp_size, index % 100, index))
+    return tmp_ret
+
+
+def timed(func):
+    tmp_start = time.perf_counter()
+    func()
+    return time.perf_counter() - tmp_start
+
+
+def main():
+    listing = make_listing(LINES)
+    dum = DataUnitManager(unitset=BIN_BYT, force_non_specific=True)
+
+    split_time = timed(lambda: [line.split(None, 1)[0] for line in listing])
+    listing_time = timed(lambda: data_units.parse_listing(listing))
+    many_time = timed(lambda: dum.parse_many([line.split(None, 1)[0] for line in listing]))
+
+    print('%d lines' % LINES)
+    print('%-24s %8.3f s' % ('str.split only', split_time))
+    print('%-24s %8.3f s  (%.1fx split)' % ('parse_listing', listing_time, listing_time / split_time))
+    print('%-24s %8.3f s  (%.1fx split)' % ('split + parse_many', many_time, many_time / split_time))
+
+
+if __name__ == '__main__':
+    main()
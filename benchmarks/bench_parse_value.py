@@ -0,0 +1,67 @@
+"""
+Times DataUnitManager._parse_value (splitting a value into the number and the unit text) on typical log tokens.
+
+To compare with another checkout (the baseline, or the commit before a change), pass its path, the same timings are
+run in it and the speedup is shown:
+
+    git worktree add /tmp/before <commit>
+    python benchmarks/bench_parse_value.py /tmp/before
+
+run from the repository root with:
+
+    python benchmarks/bench_parse_value.py
+"""
+import json
+import os
+import subprocess
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+TOKENS = ['4096', '4 KB', '512 MiB', '1.5 GB', '-2-Mb', '0.25 megabytes', '10 Mb per second', 12345]
+NUMBER = 20000
+REPEAT = 7
+
+# the timing is run in a child process for each checkout, so the two do not share any imports.
+CHILD = '''
+import json, sys, timeit
+sys.path.insert(0, sys.argv[1])
+from data_unit_calc import data_units
+parse_value = data_units._parse_value
+tmp_ret = []
+for token in json.loads(sys.argv[2]):
+    tmp_ret.append(min(timeit.repeat(lambda: parse_value(token), number=%d, repeat=%d)) / %d * 1e6)
+print(json.dumps(tmp_ret))
+''' % (NUMBER, REPEAT, NUMBER)
+
+
+def time_tokens(path):
+    return json.loads(subprocess.check_output([sys.executable, '-c', CHILD, path, json.dumps(TOKENS)]))
+
+
+def main(rounds=10):
+    # the checkouts are timed in turns and the fastest of the rounds is kept, to keep the noise out.
+    paths = [ROOT_DIR] + sys.argv[1:2]
+    tmp_times = [None] * len(paths)
+    for index in range(rounds):
+        for path_index, path in enumerate(paths):
+            tmp_round = time_tokens(path)
+            if tmp_times[path_index] is None:
+                tmp_times[path_index] = tmp_round
+            else:
+                tmp_times[path_index] = [min(a, b) for a, b in zip(tmp_times[path_index], tmp_round)]
+
+    after = tmp_times[0]
+    if len(paths) > 1:
+        before = tmp_times[1]
+        print('%-20s %12s %12s %8s' % ('token', 'before (us)', 'after (us)', 'speedup'))
+        for token, before_time, after_time in zip(TOKENS, before, after):
+            print('%-20r %12.3f %12.3f %7.2fx' % (token, before_time, after_time, before_time / after_time))
+    else:
+        print('%-20s %12s' % ('token', 'time (us)'))
+        for token, after_time in zip(TOKENS, after):
+            print('%-20r %12.3f' % (token, after_time))
+
+
+if __name__ == '__main__':
+    main()
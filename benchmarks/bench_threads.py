@@ -0,0 +1,67 @@
+"""
+Throughput of the shared module level data_units and data_size_calculator instances with 1 to N threads, and of the
+LRUCache on its own, where every thread hits one shared cache (all of them wait on its one lock) or a cache of its
+own (no lock is ever contended).  The gap between the two cache columns is the cost of the shared lock.
+
+run from the repository root with:
+
+    python benchmarks/bench_threads.py [max threads]
+"""
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data_unit_calc import data_units, data_size_calculator
+from lru_cache import LRUCache
+
+TOKENS = ['4 KB', '512 MiB', '1.5 GB', '12', '0.25 megabytes', '7 Tb', '3 kib', '-2-Mb']
+CALLS_PER_THREAD = 20000
+CACHE_CALLS_PER_THREAD = 100000
+
+
+def worker():
+    for i in range(CALLS_PER_THREAD):
+        value, unit, suffix = data_units(TOKENS[i % len(TOKENS)])
+        data_size_calculator(value, unit, 'B')
+
+
+def cache_worker(cache):
+    get = cache.get
+    for i in range(CACHE_CALLS_PER_THREAD):
+        get(TOKENS[i % len(TOKENS)])
+
+
+def make_cache():
+    tmp_cache = LRUCache()
+    for token in TOKENS:
+        tmp_cache[token] = token
+    return tmp_cache
+
+
+def run(thread_count, target, args_list, calls_per_thread):
+    threads = [threading.Thread(target=target, args=args) for args in args_list]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return thread_count * calls_per_thread / (time.perf_counter() - start)
+
+
+def main():
+    max_threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    print('%8s %14s %16s %16s' % ('threads', 'parses/sec', 'shared get/sec', 'own get/sec'))
+    for thread_count in range(1, max_threads + 1):
+        tmp_parses = run(thread_count, worker, [()] * thread_count, CALLS_PER_THREAD)
+        tmp_shared_cache = make_cache()
+        tmp_shared = run(thread_count, cache_worker, [(tmp_shared_cache,)] * thread_count, CACHE_CALLS_PER_THREAD)
+        tmp_own = run(thread_count, cache_worker, [(make_cache(),) for i in range(thread_count)],
+                      CACHE_CALLS_PER_THREAD)
+        print('%8d %14.0f %16.0f %16.0f' % (thread_count, tmp_parses, tmp_shared, tmp_own))
+
+
+if __name__ == '__main__':
+    main()
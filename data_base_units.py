@@ -1,7 +1,7 @@
 from data_unit_lookups import *
 from decimal import Decimal
 
-__all__ = ['base_data_units', 'DataBaseUnits', 'DataUnit']
+__all__ = ['base_data_units', 'DataBaseUnits', 'DataUnit', 'AliasLookup']
 
 
 def _make_plural(items, reference_key, pluralize):
@@ -39,6 +39,114 @@ def _make_bb_caps(items, reference_key, mangle_case):
 
     items.update(tmp_ret)
 
+def _bb_caps(item):
+    # the same change that _make_bb_caps makes to one item.
+    if BIT in item:
+        return item.replace('bit', 'Bit')
+    elif BYT in item:
+        return item.replace('byte', 'Byte')
+    return item
+
+
+class AliasLookup(object):
+    """
+    Looks up aliases without building every casing of every long name from the DataUnit objects.
+
+    Short names (and the non-specific aliases) are case sensitive ('Mb' is not 'MB'), so they are kept as they are in
+    an exact dictionary.  Long names are kept once, lower cased, in a folded dictionary, and a lookup that is not an
+    exact alias accepts the casings that DataUnit.aliases() would have built:
+
+        - 'megabyte', 'Megabyte', 'megaByte' or 'MegaByte' (and the plurals) if mangle_case is set
+        - 'megabyte' (and 'megabytes') if not
+
+    So a lookup returns exactly what a lookup in the full alias dictionary would return, items() builds that
+    dictionary when it is needed.
+
+    :param bool mangle_case: if True, the other casings of the long names are accepted.
+    """
+
+    def __init__(self, exact=None, folded=None, mangle_case=True):
+        self.exact = {}
+        self.folded = {}
+        self.mangle_case = mangle_case
+
+        self.update(exact or {}, folded or {})
+
+    def update(self, exact, folded):
+        """
+        Adds aliases.
+
+        :param dict exact: case sensitive aliases
+        :param dict folded: lower case long name aliases
+        """
+        self.exact.update(exact)
+        self.folded.update(folded)
+
+    def _casings(self, key):
+        # the casings of a folded alias that are accepted.
+        if self.mangle_case:
+            tmp_caps = key.capitalize()
+            return key, tmp_caps, _bb_caps(key), _bb_caps(tmp_caps)
+        return key,
+
+    def get(self, key, default=None):
+        try:
+            tmp_ret = self.exact.get(key)
+        except TypeError:
+            return default
+        if tmp_ret is not None:
+            return tmp_ret
+
+        try:
+            tmp_key = key.lower()
+        except AttributeError:
+            return default
+        tmp_ret = self.folded.get(tmp_key)
+        if tmp_ret is None:
+            return default
+        # the exact aliases were checked first, the plain lower case alias is always accepted.
+        if key == tmp_key:
+            return tmp_ret
+        if not self.mangle_case:
+            return default
+
+        # the capitalized casing ('Megabytes') is the common one, it is checked without building the others.
+        if key[1:] == tmp_key[1:]:
+            return tmp_ret if key[0] == tmp_key[0].upper() else default
+        if key in self._casings(tmp_key):
+            return tmp_ret
+        return default
+
+    def __getitem__(self, item):
+        tmp_ret = self.get(item)
+        if tmp_ret is None:
+            raise KeyError(item)
+        return tmp_ret
+
+    def __contains__(self, item):
+        return self.get(item) is not None
+
+    def items(self):
+        """
+        Returns the full alias -> short name dictionary (every accepted casing of every alias), built on each call.
+        """
+        tmp_ret = {}
+        for key, value in self.folded.items():
+            for casing in self._casings(key):
+                tmp_ret[casing] = value
+        tmp_ret.update(self.exact)
+        return tmp_ret
+
+    def __len__(self):
+        return len(self.items())
+
+    def terms(self):
+        """
+        Returns the exact and the lower case long name aliases, one for each case folded alias.
+        """
+        return list(self.exact) + list(self.folded)
+
+
 class DataUnit(object):
     def __init__(self, unit_key, unitset):
         self.base_key = unit_key
@@ -61,6 +169,7 @@ class DataUnit(object):
             self._bitbyte = False
 
         self.to_b_multiplier = Decimal(TO_BIT_CONVERSION[self.short_name])
+        self.bits_per_unit = CONVERSION_UNITS[self.short_name]
 
     def convert_unitset(self, unitset):
         return make_unit_name(self.base_key, unitset)
@@ -79,6 +188,32 @@ class DataUnit(object):
             return unitset == self.unitset
 
     def aliases(self, long_name=True, mangle_case=True, plural=True, unitset=None, force_to_unitset=False):
+        tmp_ret, tmp_ln_set, reference_key = self._alias_parts(long_name, mangle_case, plural, unitset, force_to_unitset)
+
+        if tmp_ln_set:
+            _make_caps(tmp_ln_set, reference_key, mangle_case)
+            _make_plural(tmp_ln_set, reference_key, pluralize=plural)
+            _make_bb_caps(tmp_ln_set, reference_key, mangle_case)
+
+            tmp_ret.update(tmp_ln_set)
+
+        return tmp_ret
+
+    def alias_parts(self, long_name=True, mangle_case=True, plural=True, unitset=None, force_to_unitset=False):
+        """
+        The same aliases as aliases(), split for an AliasLookup into the case sensitive short names, and the lower
+        case long names (and plurals) without the other casings.
+
+        :return: (short name dict, long name dict)
+        """
+        tmp_ret, tmp_ln_set, reference_key = self._alias_parts(long_name, mangle_case, plural, unitset, force_to_unitset)
+
+        if tmp_ln_set:
+            _make_plural(tmp_ln_set, reference_key, pluralize=plural)
+
+        return tmp_ret, tmp_ln_set
+
+    def _alias_parts(self, long_name, mangle_case, plural, unitset, force_to_unitset):
         if force_to_unitset and unitset is None:
             raise AttributeError('Cannot force to unitset if unitset is None')
         if plural and not long_name:
@@ -87,7 +222,7 @@ class DataUnit(object):
         # if the unitset does not match, but we are trying to force a specific unitset, return nothing
         if unitset is not None and not force_to_unitset:
             if not self.unitset_match(unitset):
-                return {}
+                return {}, {}, None
 
         # if unitset is used, set the reference key to the correct short name
         if unitset is not None:
@@ -111,14 +246,10 @@ class DataUnit(object):
 
         if long_name:
             tmp_ln_set = {self.long_name: reference_key}
+        else:
+            tmp_ln_set = {}
 
-            _make_caps(tmp_ln_set, reference_key, mangle_case)
-            _make_plural(tmp_ln_set, reference_key, pluralize=plural)
-            _make_bb_caps(tmp_ln_set, reference_key, mangle_case)
-
-            tmp_ret.update(tmp_ln_set)
-
-        return tmp_ret
+        return tmp_ret, tmp_ln_set, reference_key
 
     def __format__(self, format_spec):
         """
@@ -207,6 +338,13 @@ class DataBaseUnits(object):
         self._base_units = {}
         self._ref_dict = {}
 
+        # small int codes for the short names, used for columnar results.
+        self.unit_names = []
+        self.unit_codes = {}
+
+        # exact int bits per unit for each short name.
+        self.bits_per_unit = {}
+
         self.unitsets = {
             DEC_BIT: [('b', 1)],
             DEC_BYT: [('B', 1)],
@@ -221,7 +359,11 @@ class DataBaseUnits(object):
                 tmp_unit = DataUnit(unit_key=unit_key, unitset=unitset)
 
                 if self.limit_to is None or tmp_unit.unitset_match(self.limit_to):
+                    if tmp_unit.short_name not in self.unit_codes:
+                        self.unit_codes[tmp_unit.short_name] = len(self.unit_names)
+                        self.unit_names.append(tmp_unit.short_name)
                     self._base_units[tmp_unit.short_name] = tmp_unit
+                    self.bits_per_unit[tmp_unit.short_name] = tmp_unit.bits_per_unit
                     self._ref_dict[tmp_unit.short_name] = tmp_unit.short_name
                     self.unitsets[unitset].append((tmp_unit.short_name, tmp_unit.to_b_multiplier))
 
@@ -34,7 +34,6 @@ class DataSizeHelper(object):
     _storage_unit = 'b'
     _unitset = None
     _str_format = 'd:s'
-    _aliases = None
     _base_units = 'b'
     _tmp_unit = None
     _normalize_lookup_cache = None
@@ -70,7 +69,6 @@ class DataSizeHelper(object):
         self.unit = unit or default_unit
         self._tmp_unit = unit
         self.value = value
-        self._aliases = self._unit_manager.aliases()
         self.default_unit = default_unit or unit or self._default_unit
         self.unitset = unitset
 
@@ -165,6 +163,41 @@ class DataSizeHelper(object):
             self.suffix = suffix
         self.value = value
 
+    def set_compound(self, value, unit=None):
+        """
+        Sets the value from a size split across units, such as "1 GB 512 MB" or "1G+512M".  The parts are summed as
+        bits by the unit manager (see DataUnitManager.compound_to_bits), so no intermediate objects are created.
+
+        :param str value: The compound size
+        :param unit: The unit for the object, the current unit is kept if not passed.
+        :return: self
+        """
+        if unit is not None:
+            self.unit = unit
+        self._value = self._from_bits(self._unit_manager.compound_to_bits(value, default_unit=self.unit))
+        return self
+
+    @classmethod
+    def from_compound(cls, value, unit=None, **kwargs):
+        """
+        Creates a new object from a size split across units, such as "1 GB 512 MB" or "1G+512M".
+
+        :param str value: The compound size
+        :param unit: The unit for the object
+        :param kwargs: any of the other init options
+        """
+        return cls(unit=unit, **kwargs).set_compound(value)
+
+    def compound_many(self, values):
+        """
+        Parses a column of compound sizes with this object's unit manager.
+
+        :param values: iterable of compound size strings
+        :return: list of values in the storage unit.
+        """
+        tmp_from_bits = self._from_bits
+        return [tmp_from_bits(bits) for bits in self._unit_manager.compound_to_bits_many(values, default_unit=self.unit)]
+
     def get(self, unit=None):
         """
         Allows requesting the value of the object in different units
@@ -224,6 +257,11 @@ class DataSizeHelper(object):
         tmp_val, tmp_unit = self._calculator(value, from_unit, to_unit)
         return tmp_val
 
+    def _from_bits(self, bits):
+        if bits == 0 or self._storage_unit == 'b':
+            return bits
+        return self._convert(bits, from_unit='b')
+
     def _parse_value(self, value, unit=None, suffix=None):
         unit = unit or self.unit
         return self._unit_manager(value, default_unit=unit, default_suffix=suffix)
@@ -325,7 +363,7 @@ class DataSizeHelper(object):
     def __setattr__(self, key, value):
         if key in dir(self):
             super().__setattr__(key, value)
-        elif key in self._aliases:
+        elif key in self._unit_manager:
             self.set(value, key)
         else:
             raise AttributeError('%s is not a valid method or unit' % key)
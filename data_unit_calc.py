@@ -1,11 +1,673 @@
 from copy import copy
+from collections import Counter
 import math
+import sys
 from data_unit_lookups import *
 from data_base_units import *
 from starts_ends_with import StartsEndsWith
-from decimal import Decimal, InvalidOperation
+from data_unit_parser import CompiledUnitParser, LazyPattern, split_number, split_compound, is_ascii_digits, \
+    exact_multiply, make_finder, make_trie_pattern, get_number_scanner
+from lru_cache import LRUCache, CacheInfo, DEFAULT_CACHE_SIZE
+from decimal import Decimal, InvalidOperation, Context, Inexact
+from itertools import chain, islice
+
+__all__ = ['DataUnitManager', 'DataUnitColumns', 'DataUnitStream', 'DataUnitFeed', 'CompiledFormat', 'ParseFailure',
+           'AliasTable', 'data_units', 'data_size_calculator', 'DataSizeCalculator']
+
+
+class DataUnitColumns(object):
+    """
+    Columnar results from DataUnitManager.parse_many.
+
+    - bits: list of bit counts, these are ints unless one of the rows is not a whole number of bits, in which case the
+        whole column is returned as Decimals (and exact is set to False)
+    - units: array of unit codes, these index into unit_names (which is base_data_units.unit_names)
+    - suffixes: array of suffix codes, these index into suffix_names (suffix_names[0] is always None)
+
+    examples:
+
+        >>> cols = data_units.parse_many(['1 KB', '2 KB', '1 b'])
+        >>> cols.bits
+        [8000, 16000, 1]
+        >>> cols[2]
+        (1, 'b', None)
+    """
+
+    def __init__(self):
+        from array import array
+        self.bits = []
+        self.units = array('B')
+        self.suffixes = array('H')
+        self.unit_names = base_data_units.unit_names
+        self.suffix_names = [None]
+        self.exact = True
+
+    def _append(self, bits, unit_code, suffix_code):
+        if self.exact and not isinstance(bits, int):
+            self.exact = False
+            self.bits = [Decimal(b) for b in self.bits]
+        if not self.exact:
+            bits = Decimal(bits)
+        self.bits.append(bits)
+        self.units.append(unit_code)
+        self.suffixes.append(suffix_code)
+
+    def __len__(self):
+        return len(self.bits)
+
+    def __getitem__(self, item):
+        return self.bits[item], self.unit_names[self.units[item]], self.suffix_names[self.suffixes[item]]
+
+    def __iter__(self):
+        for index in range(len(self.bits)):
+            yield self[index]
+
+
+class ParseFailure(object):
+    """
+    Returned by DataUnitManager.try_parse instead of raising when a value cannot be parsed.  Failures are always False
+    in a boolean context.
+
+    - value: the value that was passed
+    - code: one of the codes below
+    - message: the message that the AttributeError would have had
+
+    codes:
+        - 'bad_number': the value does not start with a number
+        - 'unknown_unit': the unit did not match any alias
+        - 'unknown_suffix': a unit was found, but the text after it did not match any suffix
+        - 'leftover_text': a unit and suffix were found, but there was unmatched text between them
+
+    examples:
+
+        >>> data_units.try_parse('five MB')
+        ParseFailure('five MB', 'bad_number')
+    """
+    BAD_NUMBER = 'bad_number'
+    UNKNOWN_UNIT = 'unknown_unit'
+    UNKNOWN_SUFFIX = 'unknown_suffix'
+    LEFTOVER_TEXT = 'leftover_text'
+
+    __slots__ = ('value', 'code', 'message')
+
+    def __init__(self, value, code, message=''):
+        self.value = value
+        self.code = code
+        self.message = message
+
+    def __bool__(self):
+        return False
+
+    def __eq__(self, other):
+        if isinstance(other, ParseFailure):
+            return self.value == other.value and self.code == other.code
+        return NotImplemented
+
+    def __repr__(self):
+        return 'ParseFailure(%r, %r)' % (self.value, self.code)
+
+
+class DataUnitStream(object):
+    """
+    Parses a stream of values, resolving the non-specific units ('K', 'meg', 'gig', etc...) into a unitset detected
+    from the first values.  Created by DataUnitManager.stream.
+
+    The first sample_size values are parsed with the aliases of the manager, and each unit that belongs to a unitset
+    ('MiB', 'kilobits') is a vote for that unitset.  Units that are only a bit or a byte ('B', 'bytes') count for
+    both unitsets of that kind, and only break ties.  The unitset with the most votes is picked (ties go to the first
+    one in UNITSET_NAMES), and every value, including the sample, is then parsed by one manager for that unitset.
+
+    If the manager has a unitset of its own, nothing is detected and the manager is used as is.
+
+    - unitset: the unitset used, this is detected the first time it is read (or when iterating starts)
+    - detected: True if the unitset was detected from the sample
+    - votes: dict of unitset -> the number of sampled values with a unit in that unitset
+
+    examples:
+
+        >>> stream = data_units.stream(['1.5 MiB', '20 K', '3 meg'])
+        >>> stream.unitset
+        'binary-byte'
+        >>> list(stream)
+        [(Decimal('1.5'), 'MiB', None), (Decimal('20'), 'KiB', None), (Decimal('3'), 'MiB', None)]
+    """
+
+    def __init__(self, unit_manager, values, sample_size=100, default_unit=None, default_suffix=None):
+        if sample_size < 0:
+            raise AttributeError('Sample size cannot be negative')
+
+        self.unit_manager = unit_manager
+        self.sample_size = sample_size
+        self.default_unit = default_unit
+        self.default_suffix = default_suffix
+        self.detected = False
+        self.votes = {}
+
+        self._values = iter(values)
+        self._sample = None
+        self._unitset = None
+        self._manager = None
+
+    def _vote(self, sample):
+        votes = dict.fromkeys(UNITSET_NAMES, 0)
+        tie_votes = dict.fromkeys(UNITSET_NAMES, 0)
+
+        for value in sample:
+            tmp_ret = self.unit_manager.try_parse(value, default_unit=_NO_UNIT)
+            if not tmp_ret or tmp_ret[1] == _NO_UNIT:
+                continue
+            try:
+                tmp_unit_info = base_data_units[tmp_ret[1]]
+            except KeyError:
+                continue
+
+            tmp_unitset = tmp_unit_info.full_unitset()
+            if tmp_unitset is not None:
+                votes[tmp_unitset] += 1
+            else:
+                for unitset in UNITSET_NAMES:
+                    if tmp_unit_info.unitset_match(unitset):
+                        tie_votes[unitset] += 1
+
+        self.votes = votes
+        return max(UNITSET_NAMES, key=lambda u: (votes[u], tie_votes[u], -UNITSET_NAMES.index(u)))
+
+    def _detect(self):
+        self._sample = list(islice(self._values, self.sample_size))
+
+        if self.unit_manager.unitset is not None:
+            self._unitset = self.unit_manager.unitset
+            self._manager = self.unit_manager
+        else:
+            self._unitset = self._vote(self._sample)
+            self._manager = self.unit_manager._get_stream_manager(self._unitset)
+            self.detected = True
+
+    @property
+    def unitset(self):
+        if self._manager is None:
+            self._detect()
+        return self._unitset
+
+    def __iter__(self):
+        if self._manager is None:
+            self._detect()
+
+        tmp_manager = self._manager
+        tmp_sample, self._sample = self._sample, []
+        for value in chain(tmp_sample, self._values):
+            yield tmp_manager(value, default_unit=self.default_unit, default_suffix=self.default_suffix)
+
+
+# the characters of the separator in front of a unit, and of the number in front of that, see DataUnitFeed._scan.
+_SEPARATOR_CHARS = ' \t-'
+_NUMBER_CHARS = '0123456789.-'
+
+
+class DataUnitFeed(object):
+    """
+    Finds data sizes in text that arrives in chunks (reads from a socket or a pipe for example), with the same matches
+    and results as DataUnitManager.finditer on the whole text, including sizes that are split across two chunks
+    ('1.5 Gi' + 'B/s').  Created by DataUnitManager.incremental.
+
+    Only the end of each chunk that could still be part of a size is kept for the next one, that is at most the
+    longest alias plus the longest suffix, and the number (however long it is) in front of them.
+
+    examples:
+
+        >>> feed = data_units.incremental()
+        >>> feed.feed('sent 1.5 Gi')
+        []
+        >>> feed.feed('B, received 512 K')
+        [(5, Decimal('1.5'), 'GiB', None)]
+        >>> feed.close()
+        []
+
+    :param unit_manager: the DataUnitManager whose aliases and suffixes are used.
+    """
+
+    def __init__(self, unit_manager):
+        self.unit_manager = unit_manager
+        self._finder = unit_manager._alias_table.finder
+        self._unit_dict = unit_manager._unit_dict
+        self._suffixes = unit_manager.suffixes
+
+        if self._finder is not None:
+            tmp_longest_suffix = max([len(suffix) for suffix in self._suffixes] or [0])
+            # every casing of an alias is as long as the alias.
+            tmp_longest_alias = max(len(alias) for alias in unit_manager._alias_table.lookup.terms())
+            # a match whose unit starts this far from the end of the text can not change when more text arrives.
+            self._settled = tmp_longest_alias + tmp_longest_suffix + 1
+        else:
+            self._settled = 0
+
+        self._carry = ''
+        self._pos = 0
+        self._offset = 0
+        self.closed = False
+
+    def _event(self, match):
+        tmp_suffix = match.group('sfx') if self._suffixes else None
+        if tmp_suffix is not None:
+            tmp_suffix = self._suffixes[tmp_suffix]
+        return (self._offset + match.start(), Decimal(match.group('num')), self._unit_dict[match.group('unit')],
+                tmp_suffix)
+
+    def _scan(self, text, final):
+        tmp_ret = []
+        tmp_pos = self._pos
+        tmp_end = len(text)
+
+        for match in self._finder.finditer(text, tmp_pos):
+            if not final and (match.end() == tmp_end or tmp_end - match.start('unit') < self._settled):
+                # more text could still make this a different (longer) match.
+                tmp_cut = match.start()
+                break
+            tmp_ret.append(self._event(match))
+            tmp_pos = match.end()
+        else:
+            # anything in the last few characters (or the number and separator in front of them) could be the start of
+            # a size.  Only the one number is kept, so the carry does not grow with a column of plain numbers.
+            tmp_cut = max(tmp_end - self._settled, tmp_pos)
+            tmp_cut = tmp_pos + len(text[tmp_pos:tmp_cut].rstrip(_SEPARATOR_CHARS).rstrip(_NUMBER_CHARS))
+
+        # two characters before the cut are kept for the look behinds at the start of a number.
+        tmp_keep = max(tmp_cut - 2, 0)
+        self._carry = text[tmp_keep:]
+        self._pos = tmp_cut - tmp_keep
+        self._offset += tmp_keep
+        return tmp_ret
+
+    def feed(self, chunk):
+        """
+        Adds the next chunk of text.
+
+        :param chunk: a string, or bytes (read as latin-1, so the offsets are byte offsets)
+        :return: list of (offset, value, unit, suffix) for each size completed by this chunk, the offset is the position
+            of the number from the start of the text.
+        """
+        if self.closed:
+            raise AttributeError('feed() called after close()')
+        if self._finder is None:
+            return []
+        if not isinstance(chunk, str):
+            chunk = str(chunk, 'latin-1')
+        return self._scan(self._carry + chunk, final=False)
+
+    def close(self):
+        """
+        Ends the text, and returns any sizes that were waiting for more text.
+
+        :return: list of (offset, value, unit, suffix)
+        """
+        if self.closed or self._finder is None:
+            self.closed = True
+            return []
+        self.closed = True
+        tmp_ret = self._scan(self._carry, final=True)
+        self._carry = ''
+        return tmp_ret
+
+
+_INT_PATTERN = r'-?[0-9]+'
+_FLOAT_PATTERN = r'-?(?:[0-9]+(?:\.[0-9]+)?|\.[0-9]+)'
+
+# "<number><separator><unit><suffix>" format specs, see CompiledFormat
+_format_spec_re = LazyPattern(r'(?s)(?P<num><int>|<float>)(?P<sep>[ -]*)(?:(?P<unit><unit>|[^\W\d_]+))?(?P<suffix>.*)\Z')
+
+# the parts of a sample for CompiledFormat.infer_spec
+_format_sample_re = LazyPattern(r'(?s)(?P<num>%s)(?P<sep>[ -]*)(?P<rest>.*)\Z' % _FLOAT_PATTERN)
+
+
+class CompiledFormat(object):
+    """
+    A parser specialized for values in one fixed format, such as "<int> KiB" or "<float><unit>/s", created by
+    DataUnitManager.compile_format.
+
+    The spec is a number placeholder ('<int>' or '<float>'), the separator (spaces or dashes), then optionally the unit
+    (an alias, or '<unit>' for any of the units passed), then the suffix text.  The units and suffix are resolved once,
+    when the format is compiled, by parsing a sample value with the manager.  So a value in the format returns exactly
+    what calling the manager would, and anything else is passed to the manager.
+
+    examples:
+
+        >>> fmt = data_units.compile_format('<int> KiB')
+        >>> fmt('512 KiB')
+        (Decimal('512'), 'KiB', None)
+        >>> fmt('1.5 gigabytes')     # not in the format, parsed by the manager
+        (Decimal('1.5'), 'GB', None)
+
+    - spec: the format spec
+    - units: the unit aliases that '<unit>' accepts (None if the spec has a fixed unit)
+
+    :param unit_manager: the DataUnitManager used to resolve the units, and for values not in the format.
+    :param str spec: the format spec
+    :param list units: the aliases '<unit>' accepts, defaults to all of the aliases of the manager.
+    :param str default_unit: The unit to use if none was found.
+    :param str default_suffix: The suffix to use if none was found
+    """
+
+    def __init__(self, unit_manager, spec, units=None, default_unit=None, default_suffix=None):
+        match = _format_spec_re.match(spec)
+        if match is None:
+            raise AttributeError('%s is not a valid format spec, it must start with <int> or <float>' % spec)
+
+        self.unit_manager = unit_manager
+        self.spec = spec
+        self.default_unit = default_unit
+        self.default_suffix = default_suffix
+        self._scanner = unit_manager._number_scanner
+
+        import re
+        tmp_sep = match.group('sep')
+        tmp_unit = match.group('unit')
+        tmp_suffix = match.group('suffix')
+
+        if self._scanner is not None:
+            tmp_number = self._scanner.pattern
+        elif match.group('num') == '<int>':
+            tmp_number = _INT_PATTERN
+        else:
+            tmp_number = _FLOAT_PATTERN
+
+        if tmp_unit == '<unit>':
+            if units is None:
+                units = unit_manager.aliases()
+            self._resolved = {}
+            for alias in units:
+                tmp_ret = self._probe(tmp_sep + alias + tmp_suffix)
+                if tmp_ret is not None:
+                    self._resolved[alias] = tmp_ret
+            if not self._resolved:
+                raise AttributeError('None of the units can be parsed in the %s format' % spec)
+            self.units = sorted(self._resolved)
+            tmp_unit_pattern = '(?P<unit>%s)' % '|'.join(
+                re.escape(alias) for alias in sorted(self._resolved, key=len, reverse=True))
+        else:
+            tmp_tail = tmp_sep + (tmp_unit or '') + tmp_suffix
+            tmp_ret = self._probe(tmp_tail)
+            if tmp_ret is None:
+                raise AttributeError('%r can not be parsed in the %s format' % (tmp_tail, spec))
+            self.units = None
+            self._resolved = tmp_ret
+            tmp_unit_pattern = re.escape(tmp_unit or '')
+
+        self._match = re.compile('(?P<num>%s)%s%s%s' % (
+            tmp_number, re.escape(tmp_sep), tmp_unit_pattern, re.escape(tmp_suffix))).fullmatch
+
+        # the fixed text after an <int>, so a value can be checked without the regex.
+        if self.units is None and self._scanner is None and match.group('num') == '<int>':
+            self._tail = tmp_sep + (tmp_unit or '') + tmp_suffix
+        else:
+            self._tail = None
+
+    def _probe(self, tail):
+        # the unit and suffix that the manager parses out of a value in the format.
+        tmp_ret = self.unit_manager.try_parse('1' + tail, default_unit=self.default_unit,
+                                              default_suffix=self.default_suffix)
+        if not tmp_ret:
+            return None
+        return tmp_ret[1], tmp_ret[2]
+
+    def __call__(self, value):
+        """
+        :param value: The item to parse
+        :return: (Decimal('value'), 'unit', 'suffix')
+        """
+        if self._tail is not None and isinstance(value, str):
+            if self._tail:
+                tmp_number = value[:-len(self._tail)] if value.endswith(self._tail) else ''
+            else:
+                tmp_number = value
+            if is_ascii_digits(tmp_number):
+                return (Decimal(tmp_number),) + self._resolved
+
+        match = self._match(value) if isinstance(value, str) else None
+        if match is None:
+            return self.unit_manager(value, default_unit=self.default_unit, default_suffix=self.default_suffix)
+
+        tmp_number = match.group('num')
+        if self._scanner is not None:
+            tmp_number = self._scanner.split(tmp_number)[0]
+
+        if self.units is None:
+            return (Decimal(tmp_number),) + self._resolved
+        return (Decimal(tmp_number),) + self._resolved[match.group('unit')]
+
+    def parse_many(self, values):
+        """
+        Runs the format for each value and returns a list of the results.
+        """
+        return [self(value) for value in values]
+
+    @staticmethod
+    def infer_spec(unit_manager, samples):
+        """
+        Works out the format spec (and the units for '<unit>') from sample values.  The separator and suffix are the
+        most common ones in the samples, the unit is fixed if all of the samples use the same one.
+
+        :return: ('spec', [units] or None)
+        """
+        tmp_suffixes = sorted(unit_manager.suffixes, key=len, reverse=True)
+        tmp_numbers = []
+        tmp_seps = Counter()
+        tmp_units = Counter()
+        tmp_found_suffixes = Counter()
+
+        for sample in samples:
+            match = _format_sample_re.match(sample) if isinstance(sample, str) else None
+            if match is None:
+                raise AttributeError('A format can not be worked out from %r' % (sample,))
+
+            tmp_rest = match.group('rest')
+            tmp_suffix = ''
+            for suffix in tmp_suffixes:
+                if tmp_rest.endswith(suffix) and tmp_rest[:-len(suffix)] in unit_manager:
+                    tmp_suffix = suffix
+                    break
+            tmp_unit = tmp_rest[:len(tmp_rest) - len(tmp_suffix)]
+            if tmp_unit and tmp_unit not in unit_manager:
+                raise AttributeError('A format can not be worked out from %r' % sample)
+
+            tmp_numbers.append(match.group('num'))
+            tmp_seps[match.group('sep')] += 1
+            tmp_units[tmp_unit] += 1
+            tmp_found_suffixes[tmp_suffix] += 1
+
+        if not tmp_numbers:
+            raise AttributeError('No samples were passed')
+
+        if all(number.lstrip('-').isdigit() for number in tmp_numbers):
+            tmp_spec = '<int>'
+        else:
+            tmp_spec = '<float>'
+
+        tmp_units = [unit for unit in tmp_units if unit]
+        if len(tmp_units) > 1:
+            tmp_unit = '<unit>'
+        else:
+            tmp_unit = ''.join(tmp_units)
+            tmp_units = None
+
+        tmp_spec += tmp_seps.most_common(1)[0][0] + tmp_unit + tmp_found_suffixes.most_common(1)[0][0]
+        return tmp_spec, tmp_units
+
+
+# bytes like objects that can be parsed in place, see _is_buffer.
+_BUFFER_TYPES = (bytes, bytearray, memoryview)
+
+
+def _is_buffer(value):
+    if isinstance(value, _BUFFER_TYPES):
+        return True
+    # an mmap object can only exist if mmap was imported, so it is not imported here to check for one.
+    tmp_mmap = sys.modules.get('mmap')
+    return tmp_mmap is not None and isinstance(value, tmp_mmap.mmap)
+
+# characters that Decimal() can accept at the start of a string (beyond unicode digits), anything else is rejected by
+# try_parse without trying to parse it.
+_NUMBER_START_CHARS = frozenset('0123456789.+-iInNsS \t\n\r\x0b\x0c')
+
+# passed as the default unit when sampling a stream, so values without a unit can be told apart.
+_NO_UNIT = '<no unit>'
+
+# unitset -> {'non-specific alias': (unit code, bits per unit)}, see _get_listing_table
+_listing_tables = {}
+
+
+def _get_listing_table(unitset):
+    # the non-specific aliases ('K', 'M', 'gig', etc...) for a unitset, resolved to unit codes and multipliers once.
+    try:
+        return _listing_tables[unitset]
+    except KeyError:
+        pass
+    if unitset not in UNITSET_NAMES:
+        raise AttributeError('%s is not a unitset' % unitset)
+    tmp_ret = {}
+    for alias, unit in base_data_units.non_specific_aliases(unitset=unitset, mangle_case=True).items():
+        tmp_ret[alias] = base_data_units.unit_codes[unit], base_data_units.bits_per_unit[unit]
+    return _listing_tables.setdefault(unitset, tmp_ret)
+
+
+class AliasTable(object):
+    """
+    The alias dictionary and matchers built for one combination of DataUnitManager options.
+
+    Tables are interned in a process wide registry by their options, so managers with the same configuration share
+    one table (and creating another one is a dictionary lookup).  Tables are shared, so they should be treated as
+    immutable.
+
+    Normally not used directly, use AliasTable.get_table() to get the shared table for a set of options.
+    """
+    _registry = {}
+
+    def __init__(self,
+                 unitset=None,
+                 allow_long_names=True,
+                 allow_plural_names=True,
+                 allow_incorrect_case=True,
+                 force_non_specific=False,
+                 force_to_unitset=False,
+                 suffixes=None,
+                 non_specific_unitset=None):
+        """
+        See DataUnitManager for the options.
+        """
+
+        self.suffixes = dict(suffixes or {})
+        self._options = dict(
+            unitset=unitset,
+            long_name=allow_long_names,
+            mangle_case=allow_incorrect_case,
+            plural=allow_plural_names,
+            force_non_specific=force_non_specific,
+            force_to_unitset=force_to_unitset,
+            non_specific_unitset=non_specific_unitset)
+
+        self.lookup = AliasLookup(mangle_case=allow_incorrect_case)
+
+        for unit_info, tmp_options in self._units():
+            self.lookup.update(*unit_info.alias_parts(**tmp_options))
+
+        if unitset and force_non_specific:
+            tmp_unit_dict = base_data_units.non_specific_aliases(unitset=unitset, mangle_case=allow_incorrect_case)
+            self.lookup.update(tmp_unit_dict, {})
+
+        if non_specific_unitset:
+            self.lookup.update(self._non_specific_gaps(self.lookup), {})
+
+        tmp_terms = self.lookup.terms()
+
+        self.suffix_check_helper = StartsEndsWith(
+            prefixes=tmp_terms,
+            suffixes=list(self.suffixes),
+            case_insensitive=allow_incorrect_case,
+        )
+
+        # the (folded) first characters of every alias and suffix, used to reject unknown units early.
+        self.first_chars = frozenset(term[:1].lower() for term in tmp_terms)
+        self.first_chars |= frozenset(term[:1].lower() for term in self.suffixes)
+
+        if CompiledUnitParser.can_compile(tmp_terms, self.suffixes):
+            self.parse_engine = CompiledUnitParser(self.lookup, self.suffixes,
+                                                   unit_pattern=make_trie_pattern(tmp_terms))
+        else:
+            self.parse_engine = None
+
+    def _non_specific_gaps(self, aliases):
+        # the non-specific aliases of non_specific_unitset that are not already aliases.
+        tmp_non_specific = base_data_units.non_specific_aliases(unitset=self._options['non_specific_unitset'],
+                                                                 mangle_case=self._options['mangle_case'])
+        return {alias: unit for alias, unit in tmp_non_specific.items() if alias not in aliases}
+
+    def _units(self):
+        tmp_options = dict(self._options)
+        del tmp_options['force_non_specific']
+        del tmp_options['non_specific_unitset']
+        if tmp_options['force_to_unitset']:
+            limit_to = None
+        else:
+            limit_to = tmp_options['unitset']
+        for unit, unit_info in base_data_units.items(limit_to=limit_to):
+            yield unit_info, tmp_options
+
+    _finder = None
+
+    @property
+    def finder(self):
+        """
+        The regex used to find sizes in free text (see make_finder), built the first time it is needed.
+        """
+        if self._finder is None:
+            self._finder = make_finder(self.lookup.items(), self.suffixes)
+        return self._finder
+
+    @staticmethod
+    def make_key(unitset=None,
+                 allow_long_names=True,
+                 allow_plural_names=True,
+                 allow_incorrect_case=True,
+                 force_non_specific=False,
+                 force_to_unitset=False,
+                 suffixes=None,
+                 non_specific_unitset=None):
+        """
+        Returns the registry key for a set of options.
+        """
+        if suffixes:
+            suffixes = tuple(sorted(suffixes.items()))
+        else:
+            suffixes = ()
+        return (unitset, bool(allow_long_names), bool(allow_plural_names), bool(allow_incorrect_case),
+                bool(force_non_specific), bool(force_to_unitset), suffixes, non_specific_unitset)
+
+    @classmethod
+    def find_table(cls, **options):
+        """
+        Returns the shared table for the options passed if it has already been built, otherwise None.
+        """
+        return cls._registry.get(cls.make_key(**options))
+
+    @classmethod
+    def get_table(cls, **options):
+        """
+        Returns the shared table for the options passed (see DataUnitManager for the options), building it if needed.
+        """
+        key = cls.make_key(**options)
+        try:
+            return cls._registry[key]
+        except KeyError:
+            pass
+
+        return cls._registry.setdefault(key, cls(**options))
+
+    @classmethod
+    def clear_registry(cls):
+        """
+        Removes all of the shared tables, managers that already have a table keep using it.
+        """
+        cls._registry.clear()
 
-__all__ = ['DataUnitManager', 'data_units', 'data_size_calculator', 'DataSizeCalculator']
 
 class DataUnitManager(object):
     DECIMAL_BYTE = 'decimal-byte'
@@ -17,8 +679,6 @@ class DataUnitManager(object):
     BINARY = 'binary'
     DECIMAL = 'decimal'
 
-    _suffix_check_helper = None
-
     """
     Converts units of measure to valid ones.
 
@@ -36,8 +696,8 @@ class DataUnitManager(object):
     a default instance is created as 'data_units', however if you wish to limit or tune how the class handles units, you
     can instantiate your own.
 
-    This creates the list of aliases on instantiation, so if you want different options, you must create different
-    objects.
+    The list of aliases is looked up the first time a value is parsed (or the aliases are used), so creating a manager
+    is cheap.  Changing an option drops the aliases, and they are looked up again for the new options when needed.
 
     examples:
 
@@ -62,6 +722,9 @@ class DataUnitManager(object):
                  parse_method='strict',   # ['strict'|'loose_unit'|'loose_suffix'|'loose']
                  default_unit='B',
                  allow_caching=True,
+                 memoize=False,
+                 non_specific_unitset=None,
+                 use_locale=None,
                  ):
         """
 
@@ -87,11 +750,25 @@ class DataUnitManager(object):
                 Will parse for a suffix that must match, but will return the passed unit if it does not match.  (not
                 recommended for normal use since this may cause key errors in other modules.)
         :param str default_unit: [default='B'], if no unit is passed, the system assumes this unit.
-        :param bool allow_caching: [default=True], for troubleshooting, turns off caching of results.
+        :param allow_caching: [default=True], if True, unit lookups are cached in a LRU cache of DEFAULT_CACHE_SIZE
+            items, an int sets the size of the cache instead.  False (or 0) turns off caching of results (for
+            troubleshooting).
+        :param memoize: [default=False], if True, whole string results of calling the manager are kept in a LRU cache
+            of DEFAULT_CACHE_SIZE items (separate from the unit lookup cache), an int sets the size of the cache
+            instead.  Useful when the same tokens are parsed over and over (log files for example).
+        :param str non_specific_unitset: [default=None] resolves the non-specific aliases that are not already units
+            ('K', 'meg', 'gig', etc...) into this unitset, without limiting the other aliases to it the way unitset
+            does.  Used by the managers that stream() creates for the unitset it detects.
+        :param use_locale: [default=None] if set, numbers are read with the decimal point and thousands separators of a
+            locale ('1,048,576.5 KB' or '1.048.576,5 KB'), and must be in that format.  True uses the current locale
+            (as it is when the option is set), or pass a locale name, a localeconv() style dictionary or a
+            NumberScanner.  The symbols are read once, parsing does not change the process locale (reading the symbols
+            of a locale name briefly does, see get_number_scanner).  finditer still finds plain numbers.
         """
 
-        if (force_non_specific or force_to_unitset) and unitset is None:
-            raise AttributeError('Unitset must be set to force convert units')
+        self._check_options(unitset=unitset, allow_long_names=allow_long_names, allow_plural_names=allow_plural_names,
+                            force_non_specific=force_non_specific, force_to_unitset=force_to_unitset,
+                            parse_method=parse_method, non_specific_unitset=non_specific_unitset)
 
         self._unitset = unitset
         self._allow_long_names = allow_long_names
@@ -99,18 +776,35 @@ class DataUnitManager(object):
         self._allow_incorrect_case = allow_incorrect_case
         self._force_non_specific = force_non_specific
         self._force_to_unitset = force_to_unitset
+        self._non_specific_unitset = non_specific_unitset
+        self._use_locale = use_locale
+        self._number_scanner = self._make_number_scanner(use_locale)
         self._suffixes = {}
 
-        self._unit_lookup_cache = {}
-        self._allow_caching = allow_caching
+        # unitset -> manager, the managers created by stream() for the unitsets it detects.
+        self._stream_managers = {}
+
+        if allow_caching is True:
+            allow_caching = DEFAULT_CACHE_SIZE
+        if allow_caching:
+            self._unit_lookup_cache = LRUCache(maxsize=allow_caching)
+        else:
+            self._unit_lookup_cache = None
+        self._allow_caching = bool(allow_caching)
+
+        if memoize is True:
+            memoize = DEFAULT_CACHE_SIZE
+        if memoize:
+            self._memo = LRUCache(maxsize=memoize)
+        else:
+            self._memo = None
 
         self.default_unit = default_unit
-        if parse_method not in ['strict', 'loose_unit', 'loose_suffix', 'loose']:
-            raise AttributeError("parse method must be one of: ['strict'|'loose_unit'|'loose_suffix']")
         self.parse_method = parse_method
-        self._unit_dict = {}
 
-        self.suffixes = suffix_sets  # this also runs the make_unit_list method
+        # the aliases are looked up now if they are already shared, or when they are first used, see __getattr__
+        self._suffixes = self._make_suffix_dict(suffix_sets)
+        self._find_alias_list()
 
 
     # <editor-fold desc=" ********************* Properties ****************************************">
@@ -118,8 +812,9 @@ class DataUnitManager(object):
         return self._unitset
 
     def set_unitset(self, value):
+        self._check_option('unitset', value)
         self._unitset = value
-        self._make_alias_list()
+        self._reset_alias_list()
 
     unitset = property(fget=get_unitset, fset=set_unitset)
 
@@ -127,8 +822,9 @@ class DataUnitManager(object):
         return self._allow_long_names
 
     def set_allow_long_names(self, value):
+        self._check_option('allow_long_names', value)
         self._allow_long_names = value
-        self._make_alias_list()
+        self._reset_alias_list()
 
     allow_long_names = property(fget=get_allow_long_names, fset=set_allow_long_names)
 
@@ -136,8 +832,9 @@ class DataUnitManager(object):
         return self._allow_plural_names
 
     def set_allow_plural_names(self, value):
+        self._check_option('allow_plural_names', value)
         self._allow_plural_names = value
-        self._make_alias_list()
+        self._reset_alias_list()
 
     allow_plural_names = property(fget=get_allow_plural_names, fset=set_allow_plural_names)
 
@@ -146,7 +843,7 @@ class DataUnitManager(object):
 
     def set_allow_incorrect_case(self, value):
         self._allow_incorrect_case = value
-        self._make_alias_list()
+        self._reset_alias_list()
 
     allow_incorrect_case = property(fget=get_allow_incorrect_case, fset=set_allow_incorrect_case)
 
@@ -154,8 +851,9 @@ class DataUnitManager(object):
         return self._force_non_specific
 
     def set_force_non_specific(self, value):
+        self._check_option('force_non_specific', value)
         self._force_non_specific = value
-        self._make_alias_list()
+        self._reset_alias_list()
 
     force_non_specific = property(fget=get_force_non_specific, fset=set_force_non_specific)
 
@@ -163,61 +861,247 @@ class DataUnitManager(object):
         return self._force_to_unitset
 
     def set_force_to_unitset(self, value):
+        self._check_option('force_to_unitset', value)
         self._force_to_unitset = value
-        self._make_alias_list()
+        self._reset_alias_list()
 
     force_to_unitset = property(fget=get_force_to_unitset, fset=set_force_to_unitset)
 
+    def get_non_specific_unitset(self):
+        return self._non_specific_unitset
+
+    def set_non_specific_unitset(self, value):
+        self._check_option('non_specific_unitset', value)
+        self._non_specific_unitset = value
+        self._reset_alias_list()
+
+    non_specific_unitset = property(fget=get_non_specific_unitset, fset=set_non_specific_unitset)
+
+    def get_use_locale(self):
+        return self._use_locale
+
+    def set_use_locale(self, value):
+        self._number_scanner = self._make_number_scanner(value)
+        self._use_locale = value
+        self._reset_alias_list()
+
+    use_locale = property(fget=get_use_locale, fset=set_use_locale)
+
     def get_suffix_set(self):
         return self._suffixes
 
     def set_suffix_set(self, value):
-        self._suffixes = {}
+        self._suffixes = self._make_suffix_dict(value)
+        self._reset_alias_list()
+
+    suffixes = property(fget=get_suffix_set, fset=set_suffix_set)
+    # </editor-fold>
+
+    _option_names = ('unitset', 'allow_long_names', 'allow_plural_names', 'allow_incorrect_case',
+                     'force_non_specific', 'force_to_unitset', 'suffixes', 'parse_method', 'default_unit',
+                     'non_specific_unitset', 'use_locale')
+
+    def configure(self, **options):
+        """
+        Changes several options at once.  The options are validated together and the aliases are only looked up
+        once (now if the table is already shared, otherwise when they are next used), instead of once for each property
+        that is set.
+
+        example:
+
+            >>> dum = DataUnitManager()
+            >>> dum.configure(unitset=BIN_BYT, force_non_specific=True, suffixes=SUFFIX_SETS) is dum
+            True
+            >>> dum('1.5 G/s')
+            (Decimal('1.5'), 'GiB', '/s')
+
+        :param options: any of: unitset, allow_long_names, allow_plural_names, allow_incorrect_case,
+            force_non_specific, force_to_unitset, suffixes (or suffix_sets), parse_method, default_unit,
+            non_specific_unitset, use_locale
+        :return: self
+        """
+        if 'suffix_sets' in options:
+            if 'suffixes' in options:
+                raise AttributeError('suffixes and suffix_sets cannot be used together')
+            options['suffixes'] = options.pop('suffix_sets')
+
+        for key in options:
+            if key not in self._option_names:
+                raise AttributeError('%s is not a valid option' % key)
+
+        tmp_options = self._get_options()
+        tmp_options.update(options)
+        self._check_options(**tmp_options)
+
+        if 'suffixes' in options:
+            tmp_options['suffixes'] = self._make_suffix_dict(options['suffixes'])
+        tmp_scanner = self._make_number_scanner(tmp_options['use_locale'])
+
+        self._unitset = tmp_options['unitset']
+        self._allow_long_names = tmp_options['allow_long_names']
+        self._allow_plural_names = tmp_options['allow_plural_names']
+        self._allow_incorrect_case = tmp_options['allow_incorrect_case']
+        self._force_non_specific = tmp_options['force_non_specific']
+        self._force_to_unitset = tmp_options['force_to_unitset']
+        self._non_specific_unitset = tmp_options['non_specific_unitset']
+        self._use_locale = tmp_options['use_locale']
+        self._number_scanner = tmp_scanner
+        self._suffixes = tmp_options['suffixes']
+        self.parse_method = tmp_options['parse_method']
+        self.default_unit = tmp_options['default_unit']
+
+        self._reset_alias_list()
+        return self
+
+    def _get_options(self):
+        return {key: getattr(self, key) for key in self._option_names}
+
+    @staticmethod
+    def _check_options(unitset=None, allow_long_names=True, allow_plural_names=True, force_non_specific=False,
+                       force_to_unitset=False, parse_method='strict', non_specific_unitset=None, **options):
+        # options that cannot be used together are refused when they are set, only building the aliases waits for
+        # their first use.
+        if (force_non_specific or force_to_unitset) and unitset is None:
+            raise AttributeError('Unitset must be set to force convert units')
+        if non_specific_unitset is not None and non_specific_unitset not in UNITSET_NAMES:
+            raise AttributeError('%s is not a unitset' % non_specific_unitset)
+        if parse_method not in ['strict', 'loose_unit', 'loose_suffix', 'loose']:
+            raise AttributeError("parse method must be one of: ['strict'|'loose_unit'|'loose_suffix']")
+        if allow_plural_names and not allow_long_names:
+            raise AttributeError('Long names must be enabled to pluralize')
+
+    def _check_option(self, name, value):
+        tmp_options = self._get_options()
+        tmp_options[name] = value
+        self._check_options(**tmp_options)
+
+    @classmethod
+    def _make_suffix_dict(cls, value, suffixes=None):
+        if suffixes is None:
+            suffixes = {}
         if value is not None:
             if isinstance(value, dict):
                 for alias, suffix_list in value.items():
                     if isinstance(suffix_list, str):
                         suffix_list = [suffix_list]
                     for suffix in suffix_list:
-                        self._suffixes[suffix] = alias
+                        suffixes[suffix] = alias
             elif isinstance(value, str):
-                self._suffixes[value] = value
+                suffixes[value] = value
             elif isinstance(value, (list, tuple)):
                 for suffix in value:
-                    self.set_suffix_set(suffix)
-        self._make_alias_list()
-
-    suffixes = property(fget=get_suffix_set, fset=set_suffix_set)
-    # </editor-fold>
+                    cls._make_suffix_dict(suffix, suffixes)
+        return suffixes
+
+    @staticmethod
+    def _make_number_scanner(use_locale):
+        if use_locale is None or use_locale is False:
+            return None
+        return get_number_scanner(use_locale)
+
+    def _split_number(self, value):
+        # split_number, or the locale scanner if there is one.
+        if self._number_scanner is not None:
+            return self._number_scanner.split(value)
+        return split_number(value)
+
+    def _clear_cache(self):
+        if self._unit_lookup_cache is not None:
+            self._unit_lookup_cache.clear()
+        if self._memo is not None:
+            self._memo.clear()
+
+    _alias_attrs = ('_alias_table', '_unit_dict', '_suffix_check_helper', '_parse_engine')
+
+    def __getattr__(self, item):
+        # only called for attributes that are not set.  The alias attributes are set when the manager is created (or an
+        # option is changed) if the table is already shared, otherwise they are not set until the first time one of
+        # them is used, and the table is looked up then.  Either way they are plain instance attributes after that.
+        if item in self._alias_attrs:
+            self._make_alias_list()
+            return self.__dict__[item]
+        raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, item))
+
+    def _reset_alias_list(self):
+        # cached lookups were made with the old aliases.
+        self._clear_cache()
+        self._stream_managers = {}
+        for name in self._alias_attrs:
+            self.__dict__.pop(name, None)
+        self._find_alias_list()
+
+    def _alias_options(self):
+        return dict(
+            unitset=self.unitset,
+            allow_long_names=self.allow_long_names,
+            allow_plural_names=self.allow_plural_names,
+            allow_incorrect_case=self.allow_incorrect_case,
+            force_non_specific=self.force_non_specific,
+            force_to_unitset=self.force_to_unitset,
+            suffixes=self._suffixes,
+            non_specific_unitset=self.non_specific_unitset)
+
+    def _find_alias_list(self):
+        # sets the alias attributes now if the table for the options is already shared (which is only a dictionary
+        # lookup), the first use looks it up (or builds it) otherwise.
+        tmp_table = AliasTable.find_table(**self._alias_options())
+        if tmp_table is not None:
+            self._set_alias_table(tmp_table)
 
     def _make_alias_list(self):
+        self._set_alias_table(AliasTable.get_table(**self._alias_options()))
 
-        self._unit_dict = {}
-        if self.force_to_unitset:
-            limit_to = None
+    def _set_alias_table(self, alias_table):
+        self._alias_table = alias_table
+        self._unit_dict = alias_table.lookup
+        self._suffix_check_helper = alias_table.suffix_check_helper
+
+        # the compiled parser only reads plain numbers.
+        if self._number_scanner is None:
+            self._parse_engine = alias_table.parse_engine
         else:
-            limit_to = self.unitset
-        for unit, unit_info in base_data_units.items(limit_to=limit_to):
-            tmp_unit_dict = unit_info.aliases(
-                long_name=self.allow_long_names,
-                mangle_case=self.allow_incorrect_case,
-                plural=self.allow_plural_names,
-                unitset=self.unitset,
-                force_to_unitset=self.force_to_unitset)
-
-            self._unit_dict.update(tmp_unit_dict)
-
-        if self.unitset and self.force_non_specific:
-            tmp_unit_dict = base_data_units.non_specific_aliases(unitset=self.unitset, mangle_case=self.allow_incorrect_case)
-            self._unit_dict.update(tmp_unit_dict)
-
-        self._suffix_check_helper = StartsEndsWith(
-            prefixes=list(self._unit_dict),
-            suffixes=list(self._suffixes),
-            case_insensitive=self.allow_incorrect_case,
-        )
+            self._parse_engine = None
 
     def _parse_item(self, value, default_unit=None, default_suffix=None):
+        tmp_default_unit = default_unit or self.default_unit
+
+        if isinstance(value, str):
+            # a plain number is the default unit, without going through the parse engine.
+            if is_ascii_digits(value) and tmp_default_unit:
+                return Decimal(value), tmp_default_unit, default_suffix
+
+            # "<number> <alias>", the first thing _lookup_unit tries is the alias, so that is all that is needed.
+            # (_split_number, inlined.)
+            if self._number_scanner is None:
+                tmp_split = split_number(value)
+            else:
+                tmp_split = self._number_scanner.split(value)
+            if tmp_split is not None:
+                tmp_unit = self._unit_dict.get(tmp_split[1])
+                if tmp_unit is not None:
+                    return Decimal(tmp_split[0]), tmp_unit, default_suffix
+
+                # a unit with a suffix ("gigabytes/sec") that was seen before, the same key _lookup_unit uses.
+                if self._allow_caching:
+                    tmp_cached = self._unit_lookup_cache.get((tmp_split[1], default_unit, default_suffix))
+                    if tmp_cached is not None:
+                        return (Decimal(tmp_split[0]),) + tmp_cached
+
+            if self._parse_engine is not None:
+                tmp_ret = self._parse_engine(value, self.parse_method, tmp_default_unit, default_suffix)
+                if tmp_ret is not None:
+                    if tmp_split is not None and self._allow_caching:
+                        self._unit_lookup_cache[(tmp_split[1], default_unit, default_suffix)] = tmp_ret[1:]
+                    return tmp_ret
+
+        elif isinstance(value, (int, float, Decimal)):
+            # numbers are returned as they are, in the default unit.
+            if tmp_default_unit:
+                return value, tmp_default_unit, default_suffix
+
+        elif _is_buffer(value):
+            return self.parse_buffer(value, default_unit=default_unit, default_suffix=default_suffix)
+
         tmp_value, tmp_unit = self._parse_value(value)
         tmp_unit, tmp_suffix = self._parse_unit(tmp_unit, default_unit=default_unit, default_suffix=default_suffix)
 
@@ -231,19 +1115,31 @@ class DataUnitManager(object):
         return tmp_value, tmp_unit, tmp_suffix
 
     def _parse_unit(self, unit=None, default_unit=None, default_suffix=None):
+        tmp_unit, tmp_suffix, tmp_failure = self._lookup_unit(unit, default_unit=default_unit,
+                                                              default_suffix=default_suffix)
+        if tmp_failure is not None:
+            raise AttributeError(tmp_failure[1])
+        return tmp_unit, tmp_suffix
+
+    def _lookup_unit(self, unit=None, default_unit=None, default_suffix=None):
+        """
+        Does the work for _parse_unit without raising.
+
+        :return: ('unit', 'suffix', None) or (None, None, ('failure code', 'message'))
+        """
 
         if unit is None:
-            return default_unit or self.default_unit, default_suffix
+            return default_unit or self.default_unit, default_suffix, None
 
-        if unit in self._unit_dict:
-            return self._unit_dict[unit], default_suffix
+        tmp_ret = self._unit_dict.get(unit)
+        if tmp_ret is not None:
+            return tmp_ret, default_suffix, None
 
         if self._allow_caching:
-            lookup_unit_name = '%s-%s-%s' % (unit, default_unit, default_suffix)
-            try:
-                return self._unit_lookup_cache[lookup_unit_name]
-            except KeyError:
-                pass
+            lookup_key = (unit, default_unit, default_suffix)
+            tmp_ret = self._unit_lookup_cache.get(lookup_key)
+            if tmp_ret is not None:
+                return tmp_ret + (None,)
 
         default_unit = default_unit or self.default_unit
         tmp_unit = None
@@ -256,7 +1152,13 @@ class DataUnitManager(object):
             if remainder:
                 tmp_msg = 'Unit and suffix could not be determined, one or the other did not match.'
                 tmp_msg += '\nWe found "%s" / "%s" / "%s"' % (tmp_unit, remainder, tmp_suffix)
-                raise AttributeError(tmp_msg)
+                if tmp_unit is None:
+                    tmp_code = ParseFailure.UNKNOWN_UNIT
+                elif tmp_suffix is None:
+                    tmp_code = ParseFailure.UNKNOWN_SUFFIX
+                else:
+                    tmp_code = ParseFailure.LEFTOVER_TEXT
+                return None, None, (tmp_code, tmp_msg)
 
             tmp_unit = self._unit_dict.get(tmp_unit, default_unit)
             tmp_suffix = self._suffixes.get(tmp_suffix, default_suffix)
@@ -296,14 +1198,33 @@ class DataUnitManager(object):
             tmp_suffix = self._suffixes.get(tmp_suffix,default_suffix)
 
         if tmp_unit == '' or tmp_unit is None:
-            raise AttributeError('Could not parse unit out of %s' % unit)
+            return None, None, (ParseFailure.UNKNOWN_UNIT, 'Could not parse unit out of %s' % unit)
 
         if self._allow_caching:
-            self._unit_lookup_cache[lookup_unit_name] = tmp_unit, tmp_suffix
+            self._unit_lookup_cache[lookup_key] = tmp_unit, tmp_suffix
 
-        return tmp_unit, tmp_suffix
+        return tmp_unit, tmp_suffix, None
 
     def _parse_value(self, value):
+        # fast path, classifies the value once without raising (and catching) InvalidOperation.
+        if isinstance(value, str):
+            # Decimal reads any decimal digits, as _parse_value_generic would, the locale scanner only reads 0-9.
+            if value.isdecimal() and self._number_scanner is None:
+                return Decimal(value), ''
+            tmp_split = self._split_number(value)
+            if tmp_split is not None:
+                return Decimal(tmp_split[0]), tmp_split[1]
+            if self._number_scanner is not None:
+                raise AttributeError('%s could not be converted to a numeric value (decimal point %r, thousands '
+                                     'separator %r)' % (value, self._number_scanner.decimal_point,
+                                                        self._number_scanner.thousands_sep))
+
+        elif isinstance(value, (int, float, Decimal)):
+            return value, ''
+
+        return self._parse_value_generic(value)
+
+    def _parse_value_generic(self, value):
 
         tmp_value = value
         tmp_unit = ''
@@ -342,17 +1263,548 @@ class DataUnitManager(object):
 
         raise TypeError('%s was not a string or numeric' % value)
 
+    def _try_parse_value(self, value):
+        # the same as _parse_value, but returns None instead of raising, obviously bad strings are rejected before
+        # trying to parse them.
+        if isinstance(value, str):
+            if is_ascii_digits(value):
+                return Decimal(value), ''
+            tmp_split = self._split_number(value)
+            if tmp_split is not None:
+                return Decimal(tmp_split[0]), tmp_split[1]
+            if self._number_scanner is not None:
+                return None
+            if value[:1] not in _NUMBER_START_CHARS and not value[:1].isdecimal():
+                return None
+        elif isinstance(value, (int, float, Decimal)):
+            return value, ''
+        else:
+            return None
+
+        try:
+            return self._parse_value_generic(value)
+        except (AttributeError, IndexError):
+            return None
+
+    def try_parse(self, value, default_unit=None, default_suffix=None):
+        """
+        Parses a value the same way as calling the manager does, but returns a ParseFailure instead of raising an
+        AttributeError if the value cannot be parsed.
+
+        :param value: the value to parse (anything that can be passed to the manager)
+        :param str default_unit: The unit to use if none was found.
+        :param str default_suffix: The suffix to use if none was found
+        :return: (Decimal('value'), 'unit', 'suffix') or a ParseFailure (which is always False)
+
+        examples:
+
+            >>> data_units.try_parse('1.5 GB')
+            (Decimal('1.5'), 'GB', None)
+            >>> data_units.try_parse('1.5 XB').code
+            'unknown_unit'
+        """
+        if isinstance(value, str):
+            if is_ascii_digits(value) and (default_unit or self.default_unit):
+                return Decimal(value), default_unit or self.default_unit, default_suffix
+
+            if self._parse_engine is not None:
+                tmp_ret = self._parse_engine(value, self.parse_method, default_unit or self.default_unit,
+                                             default_suffix)
+                if tmp_ret is not None:
+                    return tmp_ret
+
+        tmp_ret = self._try_parse_value(value)
+        if tmp_ret is None:
+            return ParseFailure(value, ParseFailure.BAD_NUMBER, '%s could not be converted to a numeric value' % value)
+        tmp_value, tmp_unit = tmp_ret
+
+        # a unit that does not start like any alias or suffix can not match in strict mode.
+        if (self.parse_method == 'strict' and tmp_unit and tmp_unit not in self._unit_dict
+                and tmp_unit.lower()[:1] not in self._alias_table.first_chars):
+            return ParseFailure(value, ParseFailure.UNKNOWN_UNIT, 'Could not parse unit out of %s' % tmp_unit)
+
+        tmp_unit, tmp_suffix, tmp_failure = self._lookup_unit(tmp_unit, default_unit=default_unit,
+                                                              default_suffix=default_suffix)
+        if tmp_failure is not None:
+            return ParseFailure(value, *tmp_failure)
+
+        return tmp_value, tmp_unit, tmp_suffix
+
+    def try_parse_many(self, values, default_unit=None, default_suffix=None):
+        """
+        Runs try_parse for each value.
+
+        :param values: an iterable of values (anything that can be passed to the manager)
+        :param str default_unit: The unit to use if none was found.
+        :param str default_suffix: The suffix to use if none was found
+        :return: list with a (value, unit, suffix) tuple or a ParseFailure for each value.
+        """
+        tmp_try_parse = self.try_parse
+        return [tmp_try_parse(value, default_unit=default_unit, default_suffix=default_suffix) for value in values]
+
+    def parse_many(self, values, default_unit=None, default_suffix=None):
+        """
+        Parses an iterable of values into columns instead of returning a tuple for each one.  The unit text for each
+        row is only resolved once per batch, so a column where "MB" appears a million times only looks up "MB" once.
+
+        :param values: an iterable of values (anything that can be passed to the manager)
+        :param str default_unit: The unit to use if none was found.
+        :param str default_suffix: The suffix to use if none was found
+        :return: a DataUnitColumns object
+        """
+        tmp_ret = DataUnitColumns()
+        suffix_codes = {None: 0}
+        resolved = {}
+
+        for value in values:
+            tmp_split = None
+            if isinstance(value, str):
+                tmp_split = self._split_number(value)
+            if tmp_split is None:
+                tmp_split = self._parse_value(value)
+            tmp_value, tmp_unit = tmp_split
+
+            try:
+                tmp_unit_code, tmp_mult, tmp_suffix_code = resolved[tmp_unit]
+            except KeyError:
+                unit, suffix = self._parse_unit(tmp_unit, default_unit=default_unit, default_suffix=default_suffix)
+                try:
+                    tmp_unit_code = base_data_units.unit_codes[unit]
+                except KeyError:
+                    raise AttributeError('%s is not a known unit (from %s)' % (unit, value))
+                tmp_mult = base_data_units.bits_per_unit[unit]
+                try:
+                    tmp_suffix_code = suffix_codes[suffix]
+                except KeyError:
+                    tmp_suffix_code = suffix_codes[suffix] = len(tmp_ret.suffix_names)
+                    tmp_ret.suffix_names.append(suffix)
+                resolved[tmp_unit] = tmp_unit_code, tmp_mult, tmp_suffix_code
+
+            tmp_ret._append(exact_multiply(tmp_value, tmp_mult), tmp_unit_code, tmp_suffix_code)
+
+        return tmp_ret
+
+    @staticmethod
+    def _listing_column(line, maxsplit, column):
+        try:
+            return line.split(None, maxsplit)[column]
+        except IndexError:
+            return None
+
+    def _parse_listing_token(self, token, table, default_entry):
+        # parses one size token for parse_listing, returns (bits, unit code) or None.
+        tmp_entry = table.get(token[-1])
+        if tmp_entry is None:
+            tmp_number = token
+            tmp_entry = default_entry
+        else:
+            tmp_number = token[:-1]
+
+        # plain digits with an optional fraction can go straight to exact_multiply.
+        int_part, dot, frac_part = tmp_number.partition('.')
+        if (is_ascii_digits(int_part) or (dot and frac_part and not int_part)) and (
+                not frac_part or is_ascii_digits(frac_part)) and self._number_scanner is None:
+            return exact_multiply(tmp_number, tmp_entry[1]), tmp_entry[0]
+
+        tmp_split = self._split_number(token)
+        if tmp_split is None:
+            return None
+        tmp_number, tmp_unit = tmp_split
+
+        if tmp_unit:
+            tmp_entry = table.get(tmp_unit)
+        else:
+            tmp_entry = default_entry
+
+        if tmp_entry is None:
+            tmp_unit, tmp_suffix, tmp_failure = self._lookup_unit(tmp_unit)
+            if tmp_failure is not None or tmp_unit not in base_data_units.unit_codes:
+                return None
+            tmp_entry = base_data_units.unit_codes[tmp_unit], base_data_units.bits_per_unit[tmp_unit]
+
+        return exact_multiply(tmp_number, tmp_entry[1]), tmp_entry[0]
+
+    def parse_listing(self, lines, column=0, unitset=BIN_BYT, default_unit=None, skip_invalid=False):
+        """
+        Parses the size column out of 'du -h', 'ls -lh' or 'df -h' style output, where sizes are a number and a single
+        letter with no space ('4.0K', '1.2G') or a plain number of bytes ('512').
+
+        The letters are the non-specific aliases of the unitset (binary bytes by default, pass DEC_BYT for the --si
+        output), other units in the column (such as '1.2GiB') are parsed with the aliases of this manager.  Lines are
+        split on whitespace, and each distinct size text is only parsed once per call (the lines are read into a list
+        first if they are not one).
+
+        examples:
+
+            >>> cols = data_units.parse_listing(['4.0K  ./docs', '1.5M  ./src', '512   ./README'])
+            >>> cols.bits
+            [32768, 12582912, 4096]
+            >>> cols[1]
+            (12582912, 'MiB', None)
+
+        :param lines: an iterable of lines (such as an open file), or a string which is split into lines.
+        :param int column: the index of the size column in the whitespace split line (0 for du, 4 for ls -l, etc...)
+        :param str unitset: [default=BIN_BYT] the unitset the single letter sizes are in.
+        :param str default_unit: the unit of plain numbers, defaults to the default_unit of the manager.
+        :param bool skip_invalid: [default=False] if True, lines where the column is missing or is not a size (headers,
+            'total' lines, etc...) are skipped instead of raising an AttributeError.
+        :return: a DataUnitColumns object with one row for each line parsed.
+        """
+        if isinstance(lines, str):
+            lines = lines.splitlines()
+
+        table = _get_listing_table(unitset)
+        default_unit = default_unit or self.default_unit
+        try:
+            default_entry = base_data_units.unit_codes[default_unit], base_data_units.bits_per_unit[default_unit]
+        except KeyError:
+            raise AttributeError('%s is not a known unit' % default_unit)
+
+        if not isinstance(lines, (list, tuple)):
+            lines = list(lines)
+
+        if column >= 0:
+            tmp_maxsplit = column + 1
+        else:
+            tmp_maxsplit = -1
+
+        try:
+            tokens = [line.split(None, tmp_maxsplit)[column] for line in lines]
+        except IndexError:
+            # some of the lines are short, these get None.
+            tokens = [self._listing_column(line, tmp_maxsplit, column) for line in lines]
+
+        # each distinct token is only parsed once.
+        resolved = {}
+        tmp_exact = True
+        tmp_invalid = False
+        for token in set(tokens):
+            if token is None:
+                tmp_row = None
+            else:
+                tmp_row = self._parse_listing_token(token, table, default_entry)
+            if tmp_row is None:
+                tmp_invalid = True
+            elif tmp_exact and not isinstance(tmp_row[0], int):
+                tmp_exact = False
+            resolved[token] = tmp_row
+
+        if not tmp_exact:
+            for token, tmp_row in resolved.items():
+                if tmp_row is not None:
+                    resolved[token] = Decimal(tmp_row[0]), tmp_row[1]
+
+        rows = list(map(resolved.__getitem__, tokens))
+        if tmp_invalid:
+            if not skip_invalid:
+                tmp_index = rows.index(None)
+                raise AttributeError('%r does not have a size in column %s' % (lines[tmp_index], column))
+            rows = [row for row in rows if row is not None]
+
+        tmp_ret = DataUnitColumns()
+        tmp_ret.exact = tmp_exact
+        tmp_ret.bits = [row[0] for row in rows]
+        from array import array
+        tmp_ret.units = array('B', [row[1] for row in rows])
+        tmp_ret.suffixes = array('H', [0]) * len(rows)
+        return tmp_ret
+
+    def _split_buffer(self, buffer, offset, length, default_unit, default_suffix):
+        if length is None:
+            tmp_end = len(buffer)
+        else:
+            tmp_end = offset + length
+
+        if self._parse_engine is not None:
+            tmp_ret = self._parse_engine.split(buffer, self.parse_method, default_unit or self.default_unit,
+                                               default_suffix, offset, tmp_end)
+            if tmp_ret is not None:
+                return tmp_ret
+
+        # anything the compiled parser cannot handle is decoded and parsed as a string.
+        try:
+            tmp_value = str(memoryview(buffer)[offset:tmp_end], 'ascii')
+        except UnicodeDecodeError:
+            raise AttributeError('%r is not an ascii value' % bytes(buffer[offset:tmp_end]))
+
+        return self._parse_item(tmp_value, default_unit=default_unit, default_suffix=default_suffix)
+
+    def parse_buffer(self, buffer, offset=0, length=None, default_unit=None, default_suffix=None):
+        """
+        Parses an ascii value directly out of a bytes, bytearray, memoryview or mmap object, without decoding it or
+        copying it to a string first.  Calling the manager with a bytes like object does the same thing.
+
+        examples:
+
+            >>> data_units.parse_buffer(b'size=512 MiB', offset=5)
+            (Decimal('512'), 'MiB', None)
+
+        :param buffer: the bytes like object
+        :param int offset: where the value starts in the buffer
+        :param int length: the length of the value, if None, the value runs to the end of the buffer.
+        :param str default_unit: The unit to use if none was found.
+        :param str default_suffix: The suffix to use if none was found
+        :return: (Decimal('value'), 'unit', 'suffix')
+        """
+        tmp_number, tmp_unit, tmp_suffix = self._split_buffer(buffer, offset, length, default_unit, default_suffix)
+        if isinstance(tmp_number, str):
+            tmp_number = Decimal(tmp_number)
+        return tmp_number, tmp_unit, tmp_suffix
+
+    def parse_spans(self, buffer, spans, default_unit=None, default_suffix=None):
+        """
+        Parses many values out of one buffer (a read buffer or mmap for example), without copying them out first.
+
+        :param buffer: the bytes like object
+        :param spans: an iterable of (offset, length) tuples, one for each value
+        :param str default_unit: The unit to use if none was found.
+        :param str default_suffix: The suffix to use if none was found
+        :return: list of (Decimal('value'), 'unit', 'suffix') tuples
+        """
+        tmp_parse_buffer = self.parse_buffer
+        return [tmp_parse_buffer(buffer, offset, length, default_unit, default_suffix) for offset, length in spans]
+
+    def _get_stream_manager(self, unitset):
+        # a manager with the same options as this one that resolves the non-specific aliases into the unitset.
+        try:
+            return self._stream_managers[unitset]
+        except KeyError:
+            pass
+
+        tmp_ret = DataUnitManager(
+            allow_long_names=self.allow_long_names,
+            allow_plural_names=self.allow_plural_names,
+            allow_incorrect_case=self.allow_incorrect_case,
+            parse_method=self.parse_method,
+            default_unit=self.default_unit,
+            allow_caching=self._unit_lookup_cache.maxsize if self._unit_lookup_cache is not None else False,
+            memoize=self._memo.maxsize if self._memo is not None else False,
+            non_specific_unitset=unitset,
+            use_locale=self._number_scanner)
+        # the suffixes are already in the normalized form, so they are set directly, and the aliases looked up again for
+        # them (the manager may have found a shared table without suffixes when it was created).
+        tmp_ret._suffixes = self._suffixes
+        tmp_ret._reset_alias_list()
+        return self._stream_managers.setdefault(unitset, tmp_ret)
+
+    def stream(self, values, sample_size=100, default_unit=None, default_suffix=None):
+        """
+        Parses a stream of values where the unitset is not known ahead of time, the non-specific units ('K', 'meg',
+        'gig', etc...) are resolved into a unitset detected from the first values, see DataUnitStream.
+
+        examples:
+
+            >>> stream = data_units.stream(['4 KiB', '512 meg', '2 gig'], sample_size=1000)
+            >>> list(stream)
+            [(Decimal('4'), 'KiB', None), (Decimal('512'), 'MiB', None), (Decimal('2'), 'GiB', None)]
+            >>> stream.unitset
+            'binary-byte'
+
+        :param values: an iterable of values (anything that can be passed to the manager)
+        :param int sample_size: [default=100] the number of values to detect the unitset from.
+        :param str default_unit: The unit to use if none was found.
+        :param str default_suffix: The suffix to use if none was found
+        :return: a DataUnitStream, iterating it yields a (Decimal('value'), 'unit', 'suffix') tuple for each value.
+        """
+        return DataUnitStream(self, values, sample_size=sample_size, default_unit=default_unit,
+                              default_suffix=default_suffix)
+
+    def _to_bits(self, value, default_unit=None, multiplier=1, places=0):
+        tmp_split = None
+        if _is_buffer(value):
+            tmp_split = self._split_buffer(value, 0, None, default_unit, None)
+        elif self._parse_engine is not None and isinstance(value, str):
+            tmp_split = self._parse_engine.split(value, self.parse_method, default_unit or self.default_unit)
+        if tmp_split is None:
+            tmp_split = self._parse_item(value, default_unit=default_unit)
+
+        try:
+            tmp_mult = base_data_units.bits_per_unit[tmp_split[1]]
+        except KeyError:
+            raise AttributeError('%s is not a known unit (from %s)' % (tmp_split[1], value))
+
+        return exact_multiply(tmp_split[0], tmp_mult * multiplier, places)
+
+    def to_bits(self, value, default_unit=None):
+        """
+        Parses a value and returns the number of bits it represents, without building a Decimal or going through the
+        DataSizeCalculator.  Any suffix is parsed but ignored.
+
+        examples:
+
+            >>> data_units.to_bits('1.5 KB')
+            12000
+            >>> data_units.to_bits('0.5 b')
+            Decimal('0.5')
+
+        :param value: The item to parse
+        :param str default_unit: The unit to use if none was found.
+        :return: an int, or an exact Decimal if the value is not a whole number of bits.
+        """
+        return self._to_bits(value, default_unit=default_unit)
+
+    def to_bytes(self, value, default_unit=None):
+        """
+        The same as to_bits, but returns the number of bytes.
+
+        :param value: The item to parse
+        :param str default_unit: The unit to use if none was found.
+        :return: an int, or an exact Decimal if the value is not a whole number of bytes.
+        """
+        # bits / 8 is bits * 125 / 1000
+        return self._to_bits(value, default_unit=default_unit, multiplier=125, places=3)
+
+    def to_bits_many(self, values, default_unit=None):
+        """
+        Runs to_bits for each value and returns a list of the results.
+        """
+        tmp_to_bits = self._to_bits
+        return [tmp_to_bits(value, default_unit) for value in values]
+
+    def to_bytes_many(self, values, default_unit=None):
+        """
+        Runs to_bytes for each value and returns a list of the results.
+        """
+        tmp_to_bits = self._to_bits
+        return [tmp_to_bits(value, default_unit, 125, 3) for value in values]
+
+    def compound_to_bits(self, value, default_unit=None):
+        """
+        Parses a size that is split across units, such as "1 GB 512 MB" or "1G+512M", and returns the total number of
+        bits.  Each part is parsed as with to_bits (parts are plain numbers, exponents are not supported) and the parts
+        are summed as ints.
+
+        examples:
+
+            >>> data_units.compound_to_bits('1 KB 512 B')
+            12096
+
+        :param str value: The compound size (an int, float or Decimal is a number of the default unit)
+        :param str default_unit: The unit to use for parts without one.
+        :return: an int, or an exact Decimal if the value is not a whole number of bits.
+        """
+        tmp_to_bits = self._to_bits
+
+        # a number is a single part.
+        if isinstance(value, (int, float, Decimal)):
+            return tmp_to_bits(value, default_unit)
+        if not isinstance(value, str):
+            raise AttributeError('%s is not a valid compound size' % value)
+
+        tmp_ret = 0
+        for part in split_compound(value):
+            if not part:
+                raise AttributeError('%s has an empty part' % value)
+            tmp_ret += tmp_to_bits(part, default_unit)
+        return tmp_ret
+
+    def compound_to_bits_many(self, values, default_unit=None):
+        """
+        Runs compound_to_bits for each value and returns a list of the results.
+        """
+        tmp_compound_to_bits = self.compound_to_bits
+        return [tmp_compound_to_bits(value, default_unit) for value in values]
+
+    def finditer(self, text):
+        """
+        Finds data sizes embedded in free text, for example "sent 1.23 GB in 4 secs".
+
+        Lines are handled one at a time, so a file object (or any other iterable of lines) can be passed without reading
+        the whole thing into memory.  Sizes must use one of the aliases and suffixes known to this manager.
+
+        example:
+
+            >>> list(data_units.finditer('sent 1.23 GB, received 512 KiB'))
+            [(5, Decimal('1.23'), 'GB', None), (23, Decimal('512'), 'KiB', None)]
+
+        :param text: a string, or an iterable of strings (such as an open file)
+        :return: yields (offset, value, unit, suffix) for each size found, the offset is the position of the number
+            from the start of the text (counting all of the lines before it).
+        """
+        if isinstance(text, str):
+            text = (text,)
+
+        finder = self._alias_table.finder
+        if finder is None:
+            return
+
+        unit_dict = self._unit_dict
+        suffixes = self._suffixes
+        offset = 0
+
+        for line in text:
+            for match in finder.finditer(line):
+                tmp_suffix = match.group('sfx') if suffixes else None
+                if tmp_suffix is not None:
+                    tmp_suffix = suffixes[tmp_suffix]
+                yield offset + match.start(), Decimal(match.group('num')), unit_dict[match.group('unit')], tmp_suffix
+            offset += len(line)
+
+    def compile_format(self, spec=None, samples=None, units=None, default_unit=None, default_suffix=None):
+        """
+        Returns a parser specialized for values in one fixed format, which is much faster than calling the manager on
+        values in that format, and passes any other value to the manager.  See CompiledFormat.
+
+        examples:
+
+            >>> fmt = data_units.compile_format('<float> <unit>', units=['KB', 'MB'])
+            >>> fmt('1.5 MB')
+            (Decimal('1.5'), 'MB', None)
+            >>> fmt = data_units.compile_format(samples=['10 KiB', '512 KiB', '3 MiB'])
+            >>> fmt.spec
+            '<int> <unit>'
+
+        :param str spec: the format spec, such as '<int> KiB' or '<float><unit>/s'
+        :param samples: values in the format, used to work out the spec (and units) if a spec is not passed.
+        :param list units: the aliases '<unit>' accepts, defaults to all of the aliases of the manager.
+        :param str default_unit: The unit to use if none was found.
+        :param str default_suffix: The suffix to use if none was found
+        :return: CompiledFormat
+        """
+        if spec is None:
+            if samples is None:
+                raise AttributeError('A spec or samples must be passed')
+            spec, tmp_units = CompiledFormat.infer_spec(self, samples)
+            if units is None:
+                units = tmp_units
+
+        return CompiledFormat(self, spec, units=units, default_unit=default_unit, default_suffix=default_suffix)
+
+    def incremental(self):
+        """
+        Returns a DataUnitFeed, which finds sizes the same way as finditer in text that is passed in chunks with
+        feed(chunk), followed by close().
+        """
+        return DataUnitFeed(self)
+
+    def cache_info(self):
+        """
+        Returns the hits, misses, evictions, maxsize and currsize of the unit lookup cache.
+        """
+        if self._unit_lookup_cache is None:
+            return CacheInfo(0, 0, 0, 0, 0)
+        return self._unit_lookup_cache.cache_info()
+
+    def memo_info(self):
+        """
+        Returns the hits, misses, evictions, maxsize and currsize of the result memo (see memoize).
+        """
+        if self._memo is None:
+            return CacheInfo(0, 0, 0, 0, 0)
+        return self._memo.cache_info()
+
     def items(self):
         """
-        Returns the dictionary of aliases -> short names.
+        Returns the dictionary of aliases -> short names.  The alias tables are shared between managers, so this is a
+        new dictionary on each call, changing it does not change this (or any other) manager.
         """
-        return self._unit_dict
+        return self._alias_table.lookup.items()
 
     def aliases(self):
         """
         Returns a list of aliases
         """
-        return list(self._unit_dict)
+        return list(self._alias_table.lookup.items())
 
     def base_units(self):
         """
@@ -362,7 +1814,7 @@ class DataUnitManager(object):
         return list(base_data_units._base_units)
 
     def __len__(self):
-        return len(self._unit_dict)
+        return len(self._alias_table.lookup)
 
     def __getitem__(self, item):
         return base_data_units[item]
@@ -388,6 +1840,21 @@ class DataUnitManager(object):
         :return:
         """
 
+        if not unit_only and self._memo is None:
+            return self._parse_item(value, default_unit, default_suffix)
+
+        # only strings are memoized, 1, 1.0 and Decimal('1') would share a key.
+        if self._memo is not None and isinstance(value, str):
+            memo_key = (value, unit_only, default_unit or self.default_unit, default_suffix, self.parse_method)
+            tmp_ret = self._memo.get(memo_key)
+            if tmp_ret is None:
+                tmp_ret = self._call(value, unit_only, default_unit, default_suffix)
+                self._memo[memo_key] = tmp_ret
+            return tmp_ret
+
+        return self._call(value, unit_only, default_unit, default_suffix)
+
+    def _call(self, value, unit_only, default_unit, default_suffix):
         if unit_only:
             tmp_unit, tmp_suffix = self._parse_unit(unit=value, default_unit=default_unit, default_suffix=default_suffix)
             # tmp_ret['unit'] = tmp_unit
@@ -401,6 +1868,53 @@ data_units = DataUnitManager(
     default_unit='B')
 
 
+def _digits_ratio(value):
+    # (numerator, denominator) of a finite Decimal from its digits, the same way exact_multiply reads them, for Python
+    # versions before Decimal.as_integer_ratio (3.6).  The ratio is not reduced.
+    sign, digits, exponent = value.as_tuple()
+    tmp_num = int(''.join(map(str, digits)))
+    if sign:
+        tmp_num = -tmp_num
+    if exponent >= 0:
+        return tmp_num * 10 ** exponent, 1
+    return tmp_num, 10 ** -exponent
+
+
+_decimal_ratio = getattr(Decimal, 'as_integer_ratio', _digits_ratio)
+
+
+def _scale(value, num, den, ratio):
+    # value * num / den, exactly, as an int if it is a whole number, otherwise as a Decimal.  ratio is num / den as an
+    # exact Decimal (or None), a fraction is value * ratio, which is rounded once, to the current context.
+    if isinstance(value, int):
+        # converting to a smaller unit, always a whole number.
+        if den == 1:
+            return value * num
+        tmp_num = value * num
+        tmp_den = den
+    else:
+        if not isinstance(value, Decimal):
+            value = Decimal(value)
+        if not value.is_finite():
+            return value * num / den
+        tmp_num, tmp_den = _decimal_ratio(value)
+        tmp_num *= num
+        tmp_den *= den
+        if tmp_den == 1:
+            return tmp_num
+
+    if tmp_num % tmp_den == 0:
+        return tmp_num // tmp_den
+    if ratio is not None:
+        return value * ratio
+    return Decimal(tmp_num) / tmp_den
+
+
+# the exact Decimal ratios of the conversion rows, see DataSizeCalculator._make_row.  The bits in every unit are
+# powers of 2 and 10, so the ratios end, the longest (b to YiB) has 58 digits.
+_ratio_context = Context(prec=100, traps=[Inexact])
+
+
 class DataSizeCalculator(object):
     DEC_BYT = DEC_BYT
     DEC_BIT = DEC_BIT
@@ -408,6 +1922,7 @@ class DataSizeCalculator(object):
     BIN_BYT = BIN_BYT
 
     def __init__(self):
+        # the exact number of bits in each unit.
         self._base_units = {}
 
         self._unitsets = {
@@ -418,38 +1933,69 @@ class DataSizeCalculator(object):
 
         self._make_initial()
 
+        # units are looked up by their code in base_data_units.unit_codes, the multiplier for a from / to pair is at
+        # _rows[from code][to code].  A row is built the first time its from unit is used, see _make_row.
+        self._unit_codes = base_data_units.unit_codes
+        self._unit_count = len(self._unit_codes)
+        self._rows = [None] * self._unit_count
+
     def _make_initial(self):
 
         for unit, unit_info in base_data_units.items():
-            self._base_units[unit_info.short_name] = {}
-
             if unit_info.base_key != 'B':
-                self._unitsets[unit_info.unitset].append((unit_info.short_name, unit_info.to_b_multiplier))
+                self._unitsets[unit_info.unitset].append((unit_info.short_name, unit_info.bits_per_unit))
 
-            self._base_units[unit_info.short_name] = {'to': {}}
-            self._base_units[unit_info.short_name]['to']['b'] = unit_info.to_b_multiplier
+            self._base_units[unit_info.short_name] = unit_info.bits_per_unit
 
         for item in self._unitsets.values():
             item.sort(key=lambda k: k[1])
 
+    def _make_row(self, from_code):
+        # (numerator, denominator, exact Decimal ratio) for every to unit, from the reduced ratio of the bits in the
+        # two units.  A row is never changed once it is built, so the rows can be shared between threads (two threads
+        # building the same row build the same tuple).
+        from_bits = self._base_units[base_data_units.unit_names[from_code]]
+        tmp_ret = []
+        for to_unit in base_data_units.unit_names:
+            to_bits = self._base_units[to_unit]
+            tmp_gcd = math.gcd(from_bits, to_bits)
+            tmp_num, tmp_den = from_bits // tmp_gcd, to_bits // tmp_gcd
+            try:
+                tmp_ratio = _ratio_context.divide(Decimal(tmp_num), Decimal(tmp_den))
+            except Inexact:
+                tmp_ratio = None
+            tmp_ret.append((tmp_num, tmp_den, tmp_ratio))
+        tmp_ret = tuple(tmp_ret)
+        self._rows[from_code] = tmp_ret
+        return tmp_ret
+
     def _get_mult(self, from_unit, to_unit):
-        tmp_from = self._base_units[from_unit]['to']
-        try:
-            return tmp_from[to_unit]
-        except KeyError:
-            tmp_from_bits = self._get_mult(from_unit, 'b')
-            tmp_to_bits = self._get_mult(to_unit, 'b')
-            tmp_from[to_unit] = tmp_from_bits / tmp_to_bits
-            return tmp_from[to_unit]
+        tmp_code = self._unit_codes[from_unit]
+        return (self._rows[tmp_code] or self._make_row(tmp_code))[self._unit_codes[to_unit]]
 
     def convert(self, value, from_unit, to_unit='b'):
-        value = Decimal(value)
-        tmp_value = value * self._get_mult(from_unit, to_unit)
-        return tmp_value
+        """
+        Converts the value exactly, the result is an int if it is a whole number, otherwise a Decimal.
+        """
+        tmp_code = self._unit_codes[from_unit]
+        tmp_num, tmp_den, tmp_ratio = (self._rows[tmp_code] or self._make_row(tmp_code))[self._unit_codes[to_unit]]
+        return _scale(value, tmp_num, tmp_den, tmp_ratio)
 
-    def normalize(self, value, unit, unitset):
-        value = Decimal(value)
+    def convert_codes(self, value, from_code, to_code):
+        """
+        The same as convert, but the units are passed as their codes in base_data_units.unit_codes (such as the units
+        column of DataUnitColumns).
+
+        :param value: A numeric value
+        :param int from_code: the code of the unit the value is in
+        :param int to_code: the code of the unit to convert to
+        """
+        if not (0 <= from_code < self._unit_count and 0 <= to_code < self._unit_count):
+            raise AttributeError('%s or %s is not a unit code' % (from_code, to_code))
+        tmp_num, tmp_den, tmp_ratio = (self._rows[from_code] or self._make_row(from_code))[to_code]
+        return _scale(value, tmp_num, tmp_den, tmp_ratio)
 
+    def normalize(self, value, unit, unitset):
         base_value = self.convert(value, from_unit=unit)
         norm_unit = 'b'
         for item in self._unitsets[unitset]:
@@ -474,10 +2020,8 @@ class DataSizeCalculator(object):
             etc...) is passed, this will convert the value to that unit.  if a unitset string is passed, this will
             normalize within that unit.
         :return: This returns a tuple in the format of:
-            (Decimal('value'), 'unit short name')
+            (value, 'unit short name'), the value is an int if it is a whole number, otherwise a Decimal.
         """
-        value = Decimal(value)
-
         if return_as in UNITSET_NAMES:
             value, unit = self.normalize(value, unit=unit, unitset=return_as)
 
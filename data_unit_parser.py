@@ -0,0 +1,606 @@
+from decimal import Decimal
+# the lock that threading.Lock returns, without importing threading.
+from _thread import allocate_lock as Lock
+
+__all__ = ['CompiledUnitParser', 'NumberScanner', 'LazyPattern', 'make_trie_pattern', 'make_finder', 'split_number',
+           'split_compound', 'is_ascii_digits', 'exact_multiply', 'get_number_scanner', 'NUMBER_PATTERN']
+
+"""
+Compiled, single pass parsing of "<number><unit><suffix>" strings.
+
+The DataUnitManager builds one of these from its alias and suffix tables whenever the alias list is rebuilt.  It
+matches the number, the unit and the suffix with one regular expression instead of walking the string one character at
+a time and then checking every alias length with StartsEndsWith.
+
+Anything that the compiled parser cannot handle with certainty (non ascii text, exponents, leading whitespace, etc...)
+returns None so that the caller can fall back to the original parsing path, which keeps the results identical.
+
+Nothing is compiled (and re and locale are not imported) until a pattern is first used, importing the module only
+defines it.
+"""
+
+# an ascii number as the DataUnitManager reads it, the negative look-ahead rejects anything that Decimal() would have
+# accepted as a whole string (exponents and underscores) or that the original parser would have refused ('1.2.3').
+NUMBER_PATTERN = r'-?(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+)(?![0-9.]|[eE][-+]?[0-9]|_[0-9])'
+
+# separators between the number and the unit, matched atomically so that a suffix cannot borrow them.
+_SEPARATOR_PATTERN = r'(?=(?P<sep>[ -]*))(?P=sep)'
+
+_END_PATTERN = r'[ -]*\Z'
+
+# re.IGNORECASE | re.ASCII, written inline so that re is not needed until a pattern is compiled.
+_FLAGS_PATTERN = '(?ia)'
+
+
+class LazyPattern(object):
+    """
+    A regular expression that is compiled the first time one of its methods is used, for module level patterns.  The
+    methods are plain attributes after that, so using them costs the same as using the compiled pattern.
+
+    :param str pattern: the pattern, flags are written inline ('(?a)...')
+    """
+
+    _methods = ('match', 'fullmatch', 'search', 'split', 'finditer', 'findall', 'sub')
+
+    def __init__(self, pattern):
+        self.pattern = pattern
+
+    def __getattr__(self, item):
+        # only called until the pattern is compiled.
+        if item not in self._methods:
+            raise AttributeError("'%s' object has no attribute '%s'" % (self.__class__.__name__, item))
+        import re
+        tmp_compiled = re.compile(self.pattern)
+        for name in self._methods:
+            setattr(self, name, getattr(tmp_compiled, name))
+        return getattr(tmp_compiled, item)
+
+
+_number_split_re = LazyPattern(r'(?a)(?P<num>%s)(?P<rest>[ -~]*)\Z' % NUMBER_PATTERN)
+
+
+def split_number(value):
+    """
+    Splits a string into the number text and the (stripped) unit text the same way DataUnitManager._parse_value does.
+
+    :param str value: the string to split
+    :return: ('number text', 'unit text') or None if the string needs the full parser.
+    """
+    match = _number_split_re.match(value)
+    if match is None:
+        return None
+    tmp_num, tmp_rest = match.groups()
+    return tmp_num, tmp_rest.strip(' -')
+
+
+def is_ascii_digits(value):
+    """
+    Returns True if the string is only the digits 0-9 (str.isdigit is also True for other digits such as "²", and
+    str.isascii is only in Python 3.7+).
+
+    :param str value: the string to check
+    :rtype: bool
+    """
+    # an ascii string encodes to one byte per character.
+    return value.isdigit() and len(value) == len(value.encode())
+
+
+# the breaks between the parts of a compound size, a '+' or a letter followed by the start of a new number.
+_compound_split_re = LazyPattern(r'[ \t]*\+[ \t]*|(?<=[^\W\d_])[ \t]*(?=-?\.?[0-9])')
+
+
+def split_compound(value):
+    """
+    Splits a compound size such as "1 GB 512 MB" or "1G+512M" into its parts.
+
+    :param str value: the string to split
+    :return: list of part strings (a single item list if the value is not compound)
+    """
+    return _compound_split_re.split(value.strip())
+
+
+class NumberScanner(object):
+    """
+    Splits strings into the number and the unit text like split_number, but reads numbers written with a locale's
+    decimal point and thousands separators ("1,048,576.5 KB", "1.048.576,5 KB"), and returns the number text in the
+    plain form that Decimal() and exact_multiply() read ("1048576.5").
+
+    The regular expression is built once from the symbols (normally a localeconv() snapshot, see get_number_scanner),
+    so scanning does not touch the process wide locale.  Separators are only accepted where the grouping puts them,
+    numbers without separators are always accepted.
+
+    examples:
+
+        >>> scanner = NumberScanner(decimal_point=',', thousands_sep='.', grouping=[3, 3, 0])
+        >>> scanner.split('1.048.576,5 KB')
+        ('1048576.5', 'KB')
+
+    :param str decimal_point: the decimal point symbol
+    :param str thousands_sep: the grouping symbol, '' if numbers are not grouped
+    :param list grouping: the group sizes from localeconv(), starting from the decimal point.  The list ends with 0
+        (repeat the last size) or locale.CHAR_MAX (no more grouping).
+    """
+
+    def __init__(self, decimal_point='.', thousands_sep='', grouping=None):
+        if not decimal_point:
+            raise AttributeError('A decimal point is required')
+        if thousands_sep == decimal_point:
+            thousands_sep = ''
+
+        self.decimal_point = decimal_point
+        self.thousands_sep = thousands_sep
+        self.grouping = list(grouping or [])
+
+        import re
+        tmp_dec = re.escape(decimal_point)
+        tmp_int = self._make_int_pattern()
+        tmp_number = r'-?(?:%s(?:%s[0-9]*)?|%s[0-9]+)' % (tmp_int, tmp_dec, tmp_dec)
+
+        # the same idea as NUMBER_PATTERN, reject anything that would have read as a longer (or different) number.
+        tmp_reject = [r'[0-9]', tmp_dec, r'[eE][-+]?[0-9]', r'_[0-9]']
+        if self.thousands_sep:
+            tmp_reject.append(re.escape(self.thousands_sep) + r'[0-9]')
+
+        self.pattern = r'%s(?!%s)' % (tmp_number, '|'.join(tmp_reject))
+        self._split_re = re.compile(r'(?P<num>%s)(?P<rest>[ -~]*)\Z' % self.pattern, re.ASCII)
+
+    def _make_int_pattern(self):
+        import locale
+        import re
+        tmp_sizes = []
+        tmp_repeat = False
+        for size in self.grouping:
+            if size == 0:
+                tmp_repeat = True
+                break
+            if size >= locale.CHAR_MAX:
+                break
+            tmp_sizes.append(size)
+
+        if not self.thousands_sep or not tmp_sizes:
+            return '[0-9]+'
+
+        # built from the left most group towards the decimal point, each level is either the left most (short) group,
+        # or the level to its left, a separator and a full group.
+        tmp_sep = re.escape(self.thousands_sep)
+        if tmp_repeat:
+            # every level past the last size uses the last size.
+            tmp_last = tmp_sizes[-1]
+            tmp_ret = '[0-9]{1,%d}(?:%s[0-9]{%d})*' % (tmp_last, tmp_sep, tmp_last)
+            tmp_levels = tmp_sizes[1:-1]
+        else:
+            tmp_ret = '[0-9]+'
+            tmp_levels = tmp_sizes[1:]
+        for size in reversed(tmp_levels):
+            tmp_ret = '(?:%s%s[0-9]{%d}|[0-9]{1,%d})' % (tmp_ret, tmp_sep, size, size)
+
+        # a grouped number needs at least one separator, anything else is read as plain digits.
+        return '(?:%s%s[0-9]{%d}(?![0-9])|[0-9]+)' % (tmp_ret, tmp_sep, tmp_sizes[0])
+
+    @classmethod
+    def from_localeconv(cls, conv=None):
+        """
+        Builds a scanner from a localeconv() dictionary, the current locale if one is not passed.
+        """
+        if conv is None:
+            import locale
+            conv = locale.localeconv()
+        return cls(decimal_point=conv['decimal_point'], thousands_sep=conv['thousands_sep'],
+                   grouping=conv['grouping'])
+
+    def split(self, value):
+        """
+        :param str value: the string to split
+        :return: ('number text', 'unit text') or None if the string does not start with a number.
+        """
+        match = self._split_re.match(value)
+        if match is None:
+            return None
+        tmp_number = match.group('num')
+        if self.thousands_sep:
+            tmp_number = tmp_number.replace(self.thousands_sep, '')
+        if self.decimal_point != '.':
+            tmp_number = tmp_number.replace(self.decimal_point, '.')
+        return tmp_number, match.group('rest').strip(' -')
+
+    def __repr__(self):
+        return 'NumberScanner(decimal_point=%r, thousands_sep=%r, grouping=%r)' % (
+            self.decimal_point, self.thousands_sep, self.grouping)
+
+
+# locale name or (decimal point, thousands separator, grouping) -> NumberScanner
+_number_scanners = {}
+_setlocale_lock = Lock()
+
+
+def _get_localeconv(locale_name):
+    # localeconv() for another locale.  Python can only read the conventions of the process locale, so LC_NUMERIC is
+    # switched to the locale and back.  The lock only keeps the calls here from overlapping, a thread that uses the
+    # numeric locale at the same time (locale.format_string, number_formatter) can see the other locale, so this is not
+    # thread safe.  get_number_scanner only does it once for each locale name.
+    import locale
+    with _setlocale_lock:
+        tmp_old = locale.setlocale(locale.LC_NUMERIC)
+        try:
+            locale.setlocale(locale.LC_NUMERIC, locale_name)
+        except locale.Error:
+            raise AttributeError('%s is not an available locale' % locale_name)
+        try:
+            return locale.localeconv()
+        finally:
+            locale.setlocale(locale.LC_NUMERIC, tmp_old)
+
+
+def get_number_scanner(use_locale=True):
+    """
+    Returns the NumberScanner for a locale, scanners are built once and shared.
+
+    A locale name is read by switching the process LC_NUMERIC locale to it and back the first time it is used, which
+    is not thread safe if other threads use the locale at the same time.  Pass a localeconv() style dictionary (or
+    call this once before starting the threads) in that case, the other kinds of use_locale do not change the locale.
+
+    :param use_locale: True for the current locale (as it is when this is called), a locale name ('de_DE.UTF-8'), a
+        localeconv() style dictionary with the decimal_point, thousands_sep and grouping keys, or a NumberScanner.
+    :return: NumberScanner
+    """
+    if isinstance(use_locale, NumberScanner):
+        return use_locale
+
+    if isinstance(use_locale, str) and use_locale in _number_scanners:
+        return _number_scanners[use_locale]
+
+    if use_locale is True:
+        import locale
+        tmp_conv = locale.localeconv()
+    elif isinstance(use_locale, str):
+        tmp_conv = _get_localeconv(use_locale)
+    elif isinstance(use_locale, dict):
+        tmp_conv = use_locale
+    else:
+        raise AttributeError('%r is not a locale' % (use_locale,))
+
+    tmp_key = (tmp_conv['decimal_point'], tmp_conv['thousands_sep'], tuple(tmp_conv['grouping']))
+    tmp_ret = _number_scanners.get(tmp_key)
+    if tmp_ret is None:
+        tmp_ret = _number_scanners.setdefault(tmp_key, NumberScanner.from_localeconv(tmp_conv))
+    if isinstance(use_locale, str):
+        _number_scanners[use_locale] = tmp_ret
+    return tmp_ret
+
+
+def exact_multiply(number, multiplier, places=0):
+    """
+    Multiplies a number by an integer multiplier (and divides it by 10 ** places) without going through float or
+    Decimal math, so the result is never rounded.
+
+    :param number: number text (as returned by split_number), int, float or Decimal
+    :param int multiplier: the integer multiplier (bits per unit for example)
+    :param int places: the result is divided by 10 ** places.
+    :return: an int if the result is a whole number, otherwise a Decimal.
+    """
+    if isinstance(number, int):
+        tmp_total = number * multiplier
+
+    elif isinstance(number, str):
+        int_part, dot, frac_part = number.partition('.')
+        tmp_digits = int_part + frac_part
+        if tmp_digits == '-' or tmp_digits == '':
+            tmp_digits += '0'
+        tmp_total = int(tmp_digits) * multiplier
+        places += len(frac_part)
+
+    else:
+        number = Decimal(number)
+        if not number.is_finite():
+            return number * multiplier
+        sign, digits, exponent = number.as_tuple()
+        tmp_total = int(''.join(map(str, digits))) * multiplier
+        if sign:
+            tmp_total = -tmp_total
+        if exponent > 0:
+            tmp_total *= 10 ** exponent
+        else:
+            places -= exponent
+
+    if not places:
+        return tmp_total
+
+    tmp_scale = 10 ** places
+    if tmp_total % tmp_scale == 0:
+        return tmp_total // tmp_scale
+    return Decimal('%dE-%d' % (tmp_total, places))
+
+
+def _decode_group(match, name):
+    tmp_ret = match.group(name)
+    if tmp_ret is None:
+        return None
+    return tmp_ret.decode('ascii')
+
+
+def _is_printable_ascii(text):
+    for char in text:
+        if not ' ' <= char <= '~':
+            return False
+    return True
+
+
+def make_trie_pattern(terms, fold_case=True):
+    """
+    Builds a regex pattern from a list of terms, folded into a trie so that common prefixes are only tested once.
+
+    The pattern will always prefer the longest term that matches.
+
+    :param terms: iterable of strings
+    :param bool fold_case: if True, the terms are case folded (the pattern is expected to be compiled with
+        re.IGNORECASE)
+    :return: pattern string, or None if no terms were passed.
+    """
+    trie = {}
+    for term in terms:
+        node = trie
+        if fold_case:
+            term = term.lower()
+        for char in term:
+            node = node.setdefault(char, {})
+        node[''] = None
+
+    if not trie:
+        return None
+
+    return _render_trie(trie)
+
+
+def _render_trie(node):
+    import re
+    alternates = []
+    for char in sorted(node):
+        if char != '':
+            alternates.append(re.escape(char) + _render_trie(node[char]))
+
+    if not alternates:
+        return ''
+
+    if len(alternates) == 1:
+        tmp_ret = alternates[0]
+    else:
+        tmp_ret = '(?:%s)' % '|'.join(alternates)
+
+    if '' in node:
+        tmp_ret = '(?:%s)?' % tmp_ret
+
+    return tmp_ret
+
+
+def make_finder(unit_dict, suffixes):
+    """
+    Builds a regex that finds "<number><unit><suffix>" tokens embedded in free text, using the exact (case sensitive)
+    aliases and suffixes, the number must not be part of a larger word (or the end of a digit grouped number, such as
+    the "567" in "1,234,567") and the token must not be followed by letters or numbers.
+
+    The match groups are 'num', 'unit' and 'sfx'.
+
+    :param dict unit_dict: the alias -> short name dictionary of the manager
+    :param dict suffixes: the suffix alias -> suffix dictionary of the manager
+    :return: compiled regex, or None if there are no aliases.
+    """
+    unit_pattern = make_trie_pattern(unit_dict, fold_case=False)
+    if unit_pattern is None:
+        return None
+
+    suffix_pattern = make_trie_pattern(suffixes, fold_case=False)
+    if suffix_pattern is None:
+        suffix_pattern = ''
+    else:
+        suffix_pattern = '(?P<sfx>%s)?' % suffix_pattern
+
+    import re
+    return re.compile(''.join((
+        r'(?<![\w.])(?<![0-9],)(?P<num>-?(?:[0-9]+(?:\.[0-9]+)?|\.[0-9]+))(?:[ \t]*|-)',
+        '(?P<unit>', unit_pattern, ')',
+        suffix_pattern,
+        r'(?![A-Za-z0-9])')), re.ASCII)
+
+
+class CompiledUnitParser(object):
+    """
+    Parses a string into (value, unit, suffix) in one pass, returning exactly what the 'strict', 'loose_unit' and
+    'loose_suffix' parse methods of the DataUnitManager return.
+
+    This is normally not used directly, the DataUnitManager creates one in _make_alias_list.
+
+    :param dict unit_dict: the alias -> short name dictionary of the manager
+    :param dict suffixes: the suffix alias -> suffix dictionary of the manager
+    :param str unit_pattern: a prebuilt make_trie_pattern(unit_dict) pattern, built here if not passed.
+    """
+
+    def __init__(self, unit_dict, suffixes, unit_pattern=None):
+        self._unit_dict = unit_dict
+        self._suffixes = suffixes
+        self._patterns = {}
+        self._bytes_patterns = {}
+
+        if unit_pattern is None:
+            unit_pattern = make_trie_pattern(unit_dict)
+        self.unit_pattern = unit_pattern
+
+        # suffixes that end with a separator can never match (the unit text is stripped of those) so they are left out.
+        self.suffix_pattern = make_trie_pattern([s for s in suffixes if s[-1] not in ' -'])
+
+    @staticmethod
+    def can_compile(unit_dict, suffixes):
+        """
+        Returns True if the alias and suffix tables can be handled by the compiled parser.
+        """
+        for term in suffixes:
+            if term == '' or not _is_printable_ascii(term):
+                return False
+
+        for term in unit_dict:
+            if term == '' or not _is_printable_ascii(term) or ' ' in term or '-' in term:
+                return False
+
+        return True
+
+    def _optional(self, pattern, name):
+        if pattern is None:
+            return ''
+        return '(?P<%s>%s)?' % (name, pattern)
+
+    def _atomic_unit(self):
+        if self.unit_pattern is None:
+            return '(?P<unit>)'
+        return '(?=(?P<unit>%s)?)(?(unit)(?P=unit))' % self.unit_pattern
+
+    def _make_pattern(self, parse_method):
+        if parse_method == 'strict':
+            return ''.join((
+                '(?P<num>', NUMBER_PATTERN, ')',
+                _SEPARATOR_PATTERN,
+                self._atomic_unit(),
+                self._optional(self.suffix_pattern, 'sfx'),
+                _END_PATTERN))
+
+        elif parse_method == 'loose_suffix':
+            return ''.join((
+                '(?P<num>', NUMBER_PATTERN, ')',
+                _SEPARATOR_PATTERN,
+                self._atomic_unit(),
+                '(?P<left>[ -~]*?)',
+                self._optional(self.suffix_pattern, 'sfx'),
+                _END_PATTERN))
+
+        elif parse_method == 'loose_unit':
+            return ''.join((
+                '(?P<num>', NUMBER_PATTERN, ')',
+                _SEPARATOR_PATTERN,
+                '(?P<left>[ -~]*?)',
+                self._optional(self.suffix_pattern, 'sfx'),
+                _END_PATTERN))
+
+        # the longest alias at the start of the 'left' text for loose_unit
+        elif parse_method == 'prefix':
+            return self.unit_pattern
+
+        return None
+
+    def _get_pattern(self, parse_method, as_bytes=False):
+        if as_bytes:
+            patterns = self._bytes_patterns
+        else:
+            patterns = self._patterns
+
+        try:
+            return patterns[parse_method]
+        except KeyError:
+            pass
+
+        tmp_pattern = self._make_pattern(parse_method)
+
+        if tmp_pattern is not None:
+            import re
+            tmp_pattern = _FLAGS_PATTERN + tmp_pattern
+            if as_bytes:
+                tmp_pattern = tmp_pattern.encode('ascii')
+            tmp_pattern = re.compile(tmp_pattern)
+
+        patterns[parse_method] = tmp_pattern
+        return tmp_pattern
+
+    def __call__(self, value, parse_method, default_unit, default_suffix=None):
+        """
+        :param str value: the string to parse
+        :param str parse_method: ['strict'|'loose_unit'|'loose_suffix']
+        :param str default_unit: the unit to return if none is found
+        :param str default_suffix: the suffix to return if none is found
+        :return: (Decimal('value'), 'unit', 'suffix') or None if this could not be handled here.
+        """
+        if parse_method != 'strict' or not default_unit or not isinstance(value, str):
+            tmp_ret = self.split(value, parse_method, default_unit, default_suffix)
+            if tmp_ret is None:
+                return None
+            return Decimal(tmp_ret[0]), tmp_ret[1], tmp_ret[2]
+
+        # the common case, the same as split for a strict string, without the per call set up.
+        try:
+            pattern = self._patterns['strict']
+        except KeyError:
+            pattern = self._get_pattern('strict')
+
+        match = pattern.match(value)
+        if match is None:
+            return None
+
+        if self.suffix_pattern is None:
+            tmp_number, tmp_unit = match.group('num', 'unit')
+            tmp_suffix = default_suffix
+        else:
+            tmp_number, tmp_unit, tmp_suffix = match.group('num', 'unit', 'sfx')
+            tmp_suffix = self._suffixes.get(tmp_suffix, default_suffix)
+
+        return Decimal(tmp_number), self._unit_dict.get(tmp_unit, default_unit), tmp_suffix
+
+    def split(self, value, parse_method, default_unit, default_suffix=None, pos=0, endpos=None):
+        """
+        The same as calling the parser, but returns the number as text (for exact_multiply) instead of as a Decimal.
+
+        The value can also be ascii bytes, bytearray, memoryview or mmap, in which case it is matched in place, only
+        the matched number, unit and suffix text are copied out of it.
+
+        :param int pos: where to start matching in the value
+        :param int endpos: where to stop matching in the value (the end of the value if None)
+        :return: ('number text', 'unit', 'suffix') or None if this could not be handled here.
+        """
+        if not default_unit:
+            return None
+
+        as_bytes = not isinstance(value, str)
+
+        pattern = self._get_pattern(parse_method, as_bytes)
+        if pattern is None:
+            return None
+
+        if endpos is None:
+            match = pattern.match(value, pos)
+        else:
+            match = pattern.match(value, pos, endpos)
+        if match is None:
+            return None
+
+        if as_bytes:
+            group = lambda name: _decode_group(match, name)
+        else:
+            group = match.group
+
+        tmp_suffix = group('sfx') if self.suffix_pattern is not None else None
+
+        if parse_method == 'loose_unit':
+            tmp_left = group('left')
+            tmp_unit = None
+            if tmp_left and self.unit_pattern is not None:
+                tmp_prefix = self._get_pattern('prefix', as_bytes).match(value, match.start('left'), match.end('left'))
+                if tmp_prefix is not None:
+                    tmp_unit = tmp_left[:tmp_prefix.end() - tmp_prefix.start()]
+            if tmp_unit is None:
+                tmp_unit = tmp_left
+            if tmp_unit:
+                tmp_unit = self._unit_dict.get(tmp_unit, tmp_unit)
+            else:
+                tmp_unit = default_unit
+
+            tmp_suffix = self._suffixes.get(tmp_suffix, default_suffix)
+
+        else:
+            tmp_unit = self._unit_dict.get(group('unit'), default_unit)
+
+            if parse_method == 'strict':
+                tmp_suffix = self._suffixes.get(tmp_suffix, default_suffix)
+            else:
+                if tmp_suffix is None:
+                    tmp_suffix = group('left')
+                if tmp_suffix:
+                    tmp_suffix = self._suffixes.get(tmp_suffix, tmp_suffix)
+                else:
+                    tmp_suffix = default_suffix
+
+        return group('num'), tmp_unit, tmp_suffix
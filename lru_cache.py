@@ -0,0 +1,95 @@
+from collections import OrderedDict, namedtuple
+# the lock that threading.Lock returns, without importing threading.
+from _thread import allocate_lock as Lock
+
+__all__ = ['LRUCache', 'CacheInfo', 'DEFAULT_CACHE_SIZE']
+
+"""
+Small bounded, thread safe cache used for the lookup caches in the DataUnitManager.
+"""
+
+DEFAULT_CACHE_SIZE = 1024
+
+CacheInfo = namedtuple('CacheInfo', ['hits', 'misses', 'evictions', 'maxsize', 'currsize'])
+
+
+class LRUCache(object):
+    """
+    A bounded dictionary that discards the least recently used item when it is full, and keeps track of hits, misses
+    and evictions.
+
+    All of the operations hold a lock, so one cache can be shared between threads (the managers in data_unit_calc are
+    module level singletons).  It is one lock for the whole cache, so threads that share a cache take turns on it,
+    benchmarks/bench_threads.py compares a shared cache with one cache for each thread.
+
+    examples:
+
+        >>> cache = LRUCache(maxsize=2)
+        >>> cache['a'] = 1
+        >>> cache.get('a')
+        1
+        >>> cache.cache_info()
+        CacheInfo(hits=1, misses=0, evictions=0, maxsize=2, currsize=1)
+    """
+
+    def __init__(self, maxsize=DEFAULT_CACHE_SIZE):
+        """
+        :param int maxsize: the maximum number of items to keep, must be greater than 0.
+        """
+        if maxsize < 1:
+            raise AttributeError('Cache size must be greater than 0')
+
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        """
+        Returns the cached item (marking it as recently used), or the default if it is not cached.
+        """
+        # acquire / release rather than "with", it is on the path of every cached parse and is about half the cost.
+        self._lock.acquire()
+        try:
+            tmp_ret = self._data[key]
+            self._data.move_to_end(key)
+            self.hits += 1
+            return tmp_ret
+        except KeyError:
+            self.misses += 1
+            return default
+        finally:
+            self._lock.release()
+
+    def __setitem__(self, key, value):
+        self._lock.acquire()
+        try:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            if len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+        finally:
+            self._lock.release()
+
+    def clear(self):
+        """
+        Empties the cache, the counters are not reset.
+        """
+        with self._lock:
+            self._data.clear()
+
+    def cache_info(self):
+        """
+        Returns the hit, miss and eviction counts along with the max and current size.
+        """
+        with self._lock:
+            return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._data))
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, item):
+        return item in self._data
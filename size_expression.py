@@ -0,0 +1,323 @@
+import re
+from decimal import Decimal
+from fractions import Fraction
+from data_base_units import base_data_units
+from data_unit_calc import data_units
+from lru_cache import LRUCache, DEFAULT_CACHE_SIZE
+
+__all__ = ['SizeExpression', 'compile_expression', 'evaluate_expression']
+
+"""
+A small arithmetic language for data sizes, for example:
+
+    "3 * 2 TiB + 512 GiB - 5%"
+    "(total - reserved) / 4"
+
+- sizes are a number and a unit ('2 TiB', '512GiB'), the unit is parsed by a DataUnitManager.
+- plain numbers are scalars, sizes can be multiplied or divided by them, and a size divided by a size is a scalar.
+- names are variables, which are sizes passed when the expression is evaluated.
+- a percent added to or subtracted from a value is a percent of that value ('1 TB - 5%' is 950 GB), in any other
+  place it is a scalar ('1 TB * 5%' is 50 GB).
+
+Expressions are compiled once into closures working on integer bits (fractions of a bit are kept exactly), anything
+that does not use a variable is folded into a constant when it is compiled.  Compiled expressions are cached by their
+source text, so evaluating the same rule again costs a dictionary lookup and a function call.
+"""
+
+_token_re = re.compile(r'''
+    [ \t\r\n]*(?:
+        (?P<num>(?:[0-9]+(?:\.[0-9]*)?|\.[0-9]+))[ \t]*(?:(?P<pct>%)|(?P<unit>[A-Za-z]+)(?![A-Za-z0-9_]))?
+        |(?P<name>[A-Za-z_][A-Za-z0-9_]*)
+        |(?P<op>[-+*/()])
+    )''', re.VERBOSE)
+
+_end_re = re.compile(r'[ \t\r\n]*\Z')
+
+SIZE = 'size'
+SCALAR = 'scalar'
+PERCENT = 'percent'
+
+
+def _parse_number(text):
+    tmp_ret = Fraction(text)
+    if tmp_ret.denominator == 1:
+        return tmp_ret.numerator
+    return tmp_ret
+
+
+def _to_number(value):
+    # exact int or Fraction from the int / Decimal results of the unit manager.
+    if isinstance(value, int):
+        return value
+    return Fraction(value)
+
+
+def _from_number(value):
+    if isinstance(value, Fraction):
+        if value.denominator == 1:
+            return value.numerator
+        return Decimal(value.numerator) / Decimal(value.denominator)
+    return value
+
+
+def _divide(left, right, source=None):
+    try:
+        if isinstance(left, int) and isinstance(right, int) and left % right == 0:
+            return left // right
+        return Fraction(left) / right
+    except ZeroDivisionError:
+        raise AttributeError('%s divides by zero' % source)
+
+
+class _Node(object):
+    """
+    a compiled piece of an expression, func takes the variables dict and returns an int or Fraction.
+    """
+    __slots__ = ('kind', 'func', 'const')
+
+    def __init__(self, kind, func=None, const=None):
+        self.kind = kind
+        self.func = func
+        self.const = const
+
+    @classmethod
+    def constant(cls, kind, value):
+        return cls(kind, func=lambda variables: value, const=value)
+
+
+class _Compiler(object):
+
+    def __init__(self, source, unit_manager):
+        self.source = source
+        self.unit_manager = unit_manager
+        self.names = set()
+        self.tokens = self._tokenize(source)
+        self.pos = 0
+
+    def _tokenize(self, source):
+        tmp_ret = []
+        tmp_pos = 0
+        while not _end_re.match(source, tmp_pos):
+            match = _token_re.match(source, tmp_pos)
+            if match is None or match.end() == tmp_pos:
+                raise AttributeError('Could not parse "%s" at position %s' % (source, tmp_pos))
+            tmp_ret.append(match)
+            tmp_pos = match.end()
+        return tmp_ret
+
+    def _peek_op(self):
+        if self.pos < len(self.tokens):
+            return self.tokens[self.pos].group('op')
+        return None
+
+    def compile(self):
+        tmp_node = self._expr()
+        if self.pos != len(self.tokens):
+            raise AttributeError('Unexpected "%s" in "%s"' % (self.tokens[self.pos].group().strip(), self.source))
+        if tmp_node.kind == PERCENT:
+            tmp_node = self._as_scalar(tmp_node)
+        return tmp_node
+
+    def _expr(self):
+        tmp_left = self._term()
+        while self._peek_op() in ('+', '-'):
+            tmp_op = self._peek_op()
+            self.pos += 1
+            tmp_left = self._add(tmp_op, tmp_left, self._term())
+        return tmp_left
+
+    def _term(self):
+        tmp_left = self._factor()
+        while self._peek_op() in ('*', '/'):
+            tmp_op = self._peek_op()
+            self.pos += 1
+            tmp_left = self._multiply(tmp_op, tmp_left, self._factor())
+        return tmp_left
+
+    def _factor(self):
+        if self.pos >= len(self.tokens):
+            raise AttributeError('Unexpected end of "%s"' % self.source)
+
+        tmp_token = self.tokens[self.pos]
+        self.pos += 1
+        tmp_op = tmp_token.group('op')
+
+        if tmp_op == '-':
+            tmp_node = self._factor()
+            return self._combine(tmp_node.kind, lambda a: -a, tmp_node)
+
+        if tmp_op == '+':
+            return self._factor()
+
+        if tmp_op == '(':
+            tmp_node = self._expr()
+            if self._peek_op() != ')':
+                raise AttributeError('Missing ")" in "%s"' % self.source)
+            self.pos += 1
+            return tmp_node
+
+        if tmp_op is not None:
+            raise AttributeError('Unexpected "%s" in "%s"' % (tmp_op, self.source))
+
+        tmp_name = tmp_token.group('name')
+        if tmp_name is not None:
+            self.names.add(tmp_name)
+            return _Node(SIZE, func=lambda variables: variables[tmp_name])
+
+        tmp_num = tmp_token.group('num')
+        if tmp_token.group('pct'):
+            return _Node.constant(PERCENT, _divide(_parse_number(tmp_num), 100))
+        if tmp_token.group('unit'):
+            tmp_bits = self.unit_manager.to_bits('%s %s' % (tmp_num, tmp_token.group('unit')))
+            return _Node.constant(SIZE, _to_number(tmp_bits))
+        return _Node.constant(SCALAR, _parse_number(tmp_num))
+
+    def _combine(self, kind, operation, *nodes):
+        # folds the operation into a constant if all of the nodes are constants.
+        if all(node.const is not None for node in nodes):
+            return _Node.constant(kind, operation(*[node.const for node in nodes]))
+
+        if len(nodes) == 1:
+            tmp_func = nodes[0].func
+            return _Node(kind, func=lambda variables: operation(tmp_func(variables)))
+
+        tmp_left, tmp_right = nodes[0].func, nodes[1].func
+        return _Node(kind, func=lambda variables: operation(tmp_left(variables), tmp_right(variables)))
+
+    def _as_scalar(self, node):
+        return _Node(SCALAR, func=node.func, const=node.const)
+
+    def _add(self, op, left, right):
+        if right.kind == PERCENT:
+            if left.kind == PERCENT:
+                raise AttributeError('Cannot %s two percents in "%s"' % (op, self.source))
+            if op == '+':
+                return self._combine(left.kind, lambda a, p: a + a * p, left, right)
+            return self._combine(left.kind, lambda a, p: a - a * p, left, right)
+
+        if left.kind == PERCENT:
+            left = self._as_scalar(left)
+
+        if left.kind != right.kind:
+            raise AttributeError('Cannot %s a %s and a %s in "%s"' % (op, left.kind, right.kind, self.source))
+
+        if op == '+':
+            return self._combine(left.kind, lambda a, b: a + b, left, right)
+        return self._combine(left.kind, lambda a, b: a - b, left, right)
+
+    def _multiply(self, op, left, right):
+        if left.kind == PERCENT:
+            left = self._as_scalar(left)
+        if right.kind == PERCENT:
+            right = self._as_scalar(right)
+
+        if op == '*':
+            if left.kind == SIZE and right.kind == SIZE:
+                raise AttributeError('Cannot multiply two sizes in "%s"' % self.source)
+            if SIZE in (left.kind, right.kind):
+                tmp_kind = SIZE
+            else:
+                tmp_kind = SCALAR
+            return self._combine(tmp_kind, lambda a, b: a * b, left, right)
+
+        if left.kind == SCALAR and right.kind == SIZE:
+            raise AttributeError('Cannot divide a scalar by a size in "%s"' % self.source)
+        if left.kind == right.kind:
+            tmp_kind = SCALAR
+        else:
+            tmp_kind = SIZE
+        tmp_source = self.source
+        return self._combine(tmp_kind, lambda a, b: _divide(a, b, tmp_source), left, right)
+
+
+class SizeExpression(object):
+    """
+    A compiled size expression, normally created with compile_expression (which caches them).
+
+    examples:
+
+        >>> expr = compile_expression('3 * 2 TiB + 512 GiB - 5%')
+        >>> expr(unit='GiB')
+        Decimal('6323.2')
+        >>> compile_expression('total / 4')(total='1 TB', unit='GB')
+        250
+
+    :param str source: the expression
+    :param unit_manager: the DataUnitManager used to parse the units, defaults to data_units.
+    """
+
+    def __init__(self, source, unit_manager=None):
+        self.source = source
+        self.unit_manager = unit_manager or data_units
+
+        tmp_compiler = _Compiler(source, self.unit_manager)
+        tmp_node = tmp_compiler.compile()
+
+        self.kind = tmp_node.kind
+        self.names = frozenset(tmp_compiler.names)
+        self._func = tmp_node.func
+        self._const = tmp_node.const
+
+    def _get_variables(self, variables):
+        tmp_ret = {}
+        for name in self.names:
+            try:
+                tmp_value = variables[name]
+            except KeyError:
+                raise AttributeError('%s was not passed for "%s"' % (name, self.source))
+            if isinstance(tmp_value, str):
+                tmp_value = self.unit_manager.to_bits(tmp_value)
+            tmp_ret[name] = _to_number(tmp_value)
+        return tmp_ret
+
+    def evaluate(self, variables=None, unit=None):
+        """
+        :param dict variables: the sizes for the names used in the expression, as bits (int or Decimal) or as strings
+            that the unit manager can parse.
+        :param str unit: if passed, a size result is returned in this unit instead of in bits.
+        :return: the result as an int, or as a Decimal if it is not a whole number.  Sizes are in bits unless a unit
+            was passed, scalars (a size divided by a size for example) are returned as is.
+        """
+        if self._const is not None:
+            tmp_ret = self._const
+        else:
+            tmp_ret = self._func(self._get_variables(variables or {}))
+
+        if unit is not None and self.kind == SIZE:
+            try:
+                tmp_ret = _divide(tmp_ret, base_data_units.bits_per_unit[unit])
+            except KeyError:
+                raise AttributeError('%s is not a known unit' % unit)
+
+        return _from_number(tmp_ret)
+
+    def __call__(self, unit=None, **variables):
+        return self.evaluate(variables, unit=unit)
+
+    def __repr__(self):
+        return 'SizeExpression(%r)' % self.source
+
+
+_expression_cache = LRUCache(maxsize=DEFAULT_CACHE_SIZE)
+
+
+def compile_expression(source, unit_manager=None):
+    """
+    Returns the compiled SizeExpression for the source, expressions are cached by their source text (and unit manager).
+
+    :param str source: the expression
+    :param unit_manager: the DataUnitManager used to parse the units, defaults to data_units.
+    """
+    tmp_key = (source, unit_manager)
+    tmp_ret = _expression_cache.get(tmp_key)
+    if tmp_ret is None:
+        tmp_ret = SizeExpression(source, unit_manager=unit_manager)
+        _expression_cache[tmp_key] = tmp_ret
+    return tmp_ret
+
+
+def evaluate_expression(source, unit=None, unit_manager=None, **variables):
+    """
+    Compiles (or gets the cached) expression and evaluates it, see SizeExpression.evaluate.
+    """
+    return compile_expression(source, unit_manager=unit_manager).evaluate(variables, unit=unit)
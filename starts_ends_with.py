@@ -1,6 +1,15 @@
 __author__ = 'Dan Strohl'
 
+_TERMINAL = None
+
+
 class StartsEndsWith(object):
+    """
+    Finds the longest matching prefix and/or suffix of a term from lists of possible prefixes and suffixes.
+
+    The terms are kept in case folded tries, so a check walks the term once instead of testing every prefix or
+    suffix length.  Terms with non ascii characters fall back to checking each length (the results are the same).
+    """
     def __init__(self, prefixes=None, suffixes=None, case_insensitive=False):
         """
         :param prefixes: List of possible prefixes
@@ -14,9 +23,11 @@ class StartsEndsWith(object):
 
         self._prefix_term_dict = {}
         self._prefix_size_list = []
+        self._prefix_trie = {}
 
         self._suffix_term_dict = {}
         self._suffix_size_list = []
+        self._suffix_trie = {}
 
         if prefixes is None and suffixes is None:
             raise AttributeError('Some prefixes or suffixes must be defined')
@@ -35,9 +46,29 @@ class StartsEndsWith(object):
 
     def add_suffixes(self, suffixes):
         self._make_term_dict(suffixes, self._suffix_term_dict, self._suffix_size_list)
+        self._make_trie(suffixes, self._suffix_trie, reverse=True)
 
     def add_prefixes(self, prefixes):
         self._make_term_dict(prefixes, self._prefix_term_dict, self._prefix_size_list)
+        self._make_trie(prefixes, self._prefix_trie, reverse=False)
+
+    @staticmethod
+    def _make_trie(terms, trie, reverse=False):
+        trie.clear()
+        for term in terms:
+            folded = term.lower()
+            # a term that changes length when folded can never match an ascii term of the same length.
+            if len(folded) != len(term):
+                continue
+            if reverse:
+                folded = folded[::-1]
+            node = trie
+            for char in folded:
+                try:
+                    node = node[char]
+                except KeyError:
+                    node[char] = node = {}
+            node[_TERMINAL] = True
 
     def _make_term_dict(self, terms, term_dict, size_list):
         term_dict.clear()
@@ -116,6 +147,51 @@ class StartsEndsWith(object):
     def _check_term(self, term, prefix=True):
         if term is None:
             return None, None
+
+        # only ascii terms use the trie (str.isascii is Python 3.7+, an ascii term encodes to one byte per character,
+        # surrogatepass so a lone surrogate is 3 bytes instead of an error).
+        if len(term) == len(term.encode('utf-8', 'surrogatepass')):
+            return self._check_trie(term, prefix=prefix)
+
+        return self._check_term_lengths(term, prefix=prefix)
+
+    def _check_trie(self, term, prefix=True):
+        if prefix:
+            node = self._prefix_trie
+            chars = term.lower()
+        else:
+            node = self._suffix_trie
+            chars = reversed(term.lower())
+
+        # an empty suffix only matches an empty term (term[-0:] is the whole term).
+        if _TERMINAL in node and (prefix or term == ''):
+            match_len = 0
+        else:
+            match_len = -1
+        depth = 0
+        for char in chars:
+            try:
+                node = node[char]
+            except KeyError:
+                break
+            depth += 1
+            if _TERMINAL in node:
+                match_len = depth
+
+        if match_len < 0:
+            return None, term
+
+        if prefix:
+            ret_ps_term = term[:match_len]
+            ret_term = term[match_len:]
+        else:
+            ret_ps_term = term[-match_len:]
+            ret_term = term[:-match_len]
+        if ret_term == '':
+            ret_term = None
+        return ret_ps_term, ret_term
+
+    def _check_term_lengths(self, term, prefix=True):
         if prefix:
             term_dict = self._prefix_term_dict
             size_list = self._prefix_size_list
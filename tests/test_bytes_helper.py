@@ -155,7 +155,25 @@ class TestDSH(unittest.TestCase):
         self.assertEqual(800, DataSizeHelper(800).B)
 
 
+class TestDSHCompound(unittest.TestCase):
 
+    def test_from_compound(self):
+        dsh = DataSizeHelper.from_compound('1 GB 512 MB', unit='MB')
+
+        self.assertEqual(12096000000, dsh.value)
+        self.assertEqual(1512, dsh.MB)
+        self.assertEqual('MB', dsh.unit)
+
+    def test_set_compound(self):
+        dsh = DataSizeHelper(unit='B', storage_unit='B')
+
+        self.assertEqual(1024, dsh.set_compound('1 KB + 24 B').value)
+        self.assertEqual(0, dsh.set_compound('0 KB').value)
+
+    def test_compound_many(self):
+        dsh = DataSizeHelper()
+
+        self.assertEqual([8192, 1, 16], dsh.compound_many(['1 KB 24 B', '1 b', '2']))
 
 
 if __name__ == '__main__':
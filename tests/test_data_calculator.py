@@ -1,7 +1,9 @@
 import unittest
 from data_unit_calc import DataSizeCalculator, data_size_calculator
 from data_unit_lookups import *
+from data_base_units import base_data_units
 from decimal import Decimal
+from fractions import Fraction
 
 class TestDataCalc(unittest.TestCase):
 
@@ -28,3 +30,52 @@ class TestDataCalc(unittest.TestCase):
             msg = 'dsc(%r).unit = %s, expected: %s  (return:%s)' % (test[0], tmp_check[1], test[2], tmp_check)
             with self.subTest(m=msg):
                 self.assertEqual(test[2], tmp_check[1])
+
+   def test_exact(self):
+        dsc = data_size_calculator
+
+        self.assertEqual(2 ** 50, dsc.convert(1, 'Pib'))
+        self.assertEqual(2 ** 83, dsc.convert(1, 'YiB'))
+        self.assertEqual(1024, dsc.convert(1, 'YiB', 'ZiB'))
+        self.assertEqual(1, dsc.convert(2 ** 80, 'B', 'YiB'))
+        self.assertEqual(1536, dsc.convert(Decimal('1.5'), 'GiB', 'MiB'))
+
+        self.assertIsInstance(dsc.convert(3, 'KiB', 'B'), int)
+        self.assertIsInstance(dsc.convert('1.5', 'GB', 'MB'), int)
+        self.assertEqual(Decimal('0.5'), dsc.convert(4, 'b', 'B'))
+        self.assertIsInstance(dsc.convert(4, 'b', 'B'), Decimal)
+
+        self.assertEqual((1, 'PiB'), dsc(1024, 'TiB', BIN_BYT))
+        self.assertEqual((Decimal('1.5'), 'EiB'), dsc(1536, 'PiB', BIN_BYT))
+
+   def test_non_finite(self):
+        self.assertEqual(Decimal('Infinity'), data_size_calculator.convert(Decimal('Infinity'), 'KB'))
+
+   def test_matrix(self):
+        dsc = DataSizeCalculator()
+        names = base_data_units.unit_names
+
+        self.assertEqual([None] * len(names), dsc._rows)
+        dsc.convert(1, 'KiB', 'KB')
+        self.assertEqual(1, len([row for row in dsc._rows if row is not None]))
+
+        for from_unit in names:
+            for to_unit in names:
+                num, den, ratio = dsc._get_mult(from_unit, to_unit)
+                self.assertEqual(base_data_units.bits_per_unit[from_unit] * den,
+                                 base_data_units.bits_per_unit[to_unit] * num)
+                self.assertEqual(Fraction(num, den), Fraction(ratio))
+
+        dsc_2 = DataSizeCalculator()
+        self.assertEqual([dsc_2._make_row(code) for code in range(len(names))], dsc._rows)
+        self.assertEqual(len(names), len(dsc._rows[0]))
+
+   def test_convert_codes(self):
+        codes = base_data_units.unit_codes
+
+        self.assertEqual(1536, data_size_calculator.convert_codes(Decimal('1.5'), codes['GiB'], codes['MiB']))
+        self.assertEqual(data_size_calculator.convert(3, 'Mb', 'KiB'),
+                         data_size_calculator.convert_codes(3, codes['Mb'], codes['KiB']))
+
+        with self.assertRaises(AttributeError):
+            data_size_calculator.convert_codes(1, codes['B'], len(codes))
@@ -0,0 +1,945 @@
+import unittest
+import sys
+import threading
+from data_unit_calc import DataUnitManager, AliasTable, DataSizeCalculator, ParseFailure, data_units, \
+    data_size_calculator
+from data_unit_parser import NumberScanner, get_number_scanner, is_ascii_digits
+import locale
+from unittest import mock
+from data_unit_lookups import *
+from decimal import Decimal
+
+
+test_parse_values = [
+    '2Mb', '2-Mb', '332-Mb', '.2-Mb', '0.2-Mb', '-2-Mb', '39 KiloBytes', '0.2-Kilobits', '5 kb', '5 MEGABYTES',
+    '1.5 gigabytes/sec', '1.5 gigabytes/s', '1 Kbps', '10 Mb per sec', '10 Mb per second ', '3 Bits/S', '2 meg',
+    '4 gig/sec', '12', '12 ', '7 b', '7 B', '9 byte ps', '1 KiB/min', '1 KiB /blah', '/s', '5', '1e3', '5 xyz']
+
+
+class TestCompiledParser(unittest.TestCase):
+
+    def _legacy_parse(self, dum, value):
+        tmp_value, tmp_unit = dum._parse_value(value)
+        tmp_unit, tmp_suffix = dum._parse_unit(tmp_unit)
+        return tmp_value, tmp_unit, tmp_suffix
+
+    def _check_manager(self, dum):
+        for value in test_parse_values:
+            try:
+                expected = self._legacy_parse(dum, value)
+            except AttributeError:
+                expected = AttributeError
+
+            try:
+                returned = dum(value)
+            except AttributeError:
+                returned = AttributeError
+
+            msg = '%s(%r) = %r, expected: %r' % (dum.parse_method, value, returned, expected)
+            with self.subTest(m=msg):
+                self.assertEqual(expected, returned)
+
+    def test_compiled_parser_used(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0])
+        self.assertIsNotNone(dum._parse_engine)
+        self.assertEqual((Decimal('1.5'), 'GB', '/s'), dum._parse_engine('1.5 gigabytes/sec', 'strict', 'B'))
+
+    def test_matches_strict(self):
+        self._check_manager(DataUnitManager(suffix_sets=SUFFIX_SETS[0], allow_caching=False))
+
+    def test_matches_loose_suffix(self):
+        self._check_manager(DataUnitManager(suffix_sets=SUFFIX_SETS[0], parse_method='loose_suffix',
+                                            allow_caching=False))
+
+    def test_matches_loose_unit(self):
+        self._check_manager(DataUnitManager(suffix_sets=SUFFIX_SETS[0], parse_method='loose_unit',
+                                            allow_caching=False))
+
+    def test_matches_unitset(self):
+        self._check_manager(DataUnitManager(unitset=BIN_BYT, force_non_specific=True, force_to_unitset=True,
+                                            suffix_sets=SUFFIX_SETS[0], allow_caching=False))
+
+    def test_fallback(self):
+        self.assertIsNone(data_units._parse_engine('1e3', 'strict', 'B'))
+        self.assertEqual((Decimal('1000'), 'B', None), data_units('1e3'))
+        self.assertEqual((10, 'B', None), data_units(10))
+
+
+class TestParseMany(unittest.TestCase):
+
+    def test_columns(self):
+        cols = data_units.parse_many(['1 KB', '2 KB', '1 b', 5, '1e3', '3 KiB'])
+
+        self.assertTrue(cols.exact)
+        self.assertEqual([8000, 16000, 1, 40, 8000, 24576], cols.bits)
+        self.assertEqual(['KB', 'KB', 'b', 'B', 'B', 'KiB'], [cols.unit_names[c] for c in cols.units])
+        self.assertEqual([0] * 6, list(cols.suffixes))
+        self.assertEqual((1, 'b', None), cols[2])
+
+    def test_decimal_fallback(self):
+        cols = data_units.parse_many(['1 KB', '0.5 b', '2 b'])
+
+        self.assertFalse(cols.exact)
+        self.assertEqual([Decimal('8000'), Decimal('0.5'), Decimal('2')], cols.bits)
+
+    def test_suffixes_and_defaults(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0])
+        cols = dum.parse_many(['1 MB/sec', '2 MBps', '3'], default_unit='Kb', default_suffix='/x')
+
+        self.assertEqual([8000000, 16000000, 3000], cols.bits)
+        self.assertEqual([(8000000, 'MB', '/s'), (16000000, 'MB', '/s'), (3000, 'Kb', '/x')], list(cols))
+
+    def test_matches_single_parse(self):
+        values = ['1.5 gigabytes', '-2-Mb', '.2-Mb', '7 YiB', '12']
+        cols = data_units.parse_many(values)
+
+        for value, row in zip(values, cols):
+            tmp_value, tmp_unit, tmp_suffix = data_units(value)
+            with self.subTest(m=value):
+                self.assertEqual(tmp_value * data_units[tmp_unit].bits_per_unit, row[0])
+                self.assertEqual((tmp_unit, tmp_suffix), row[1:])
+
+    def test_unit_resolved_once(self):
+        dum = DataUnitManager()
+        calls = []
+        parse_unit = dum._parse_unit
+
+        def counting_parse_unit(unit, **kwargs):
+            calls.append(unit)
+            return parse_unit(unit, **kwargs)
+
+        dum._parse_unit = counting_parse_unit
+        dum.parse_many(['%s MB' % i for i in range(100)])
+        self.assertEqual(['MB'], calls)
+
+
+class TestToBits(unittest.TestCase):
+
+    def test_to_bits(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0])
+
+        self.assertEqual(12000, dum.to_bits('1.5 KB'))
+        self.assertEqual(8 * 2 ** 80, dum.to_bits('1 YiB'))
+        self.assertEqual(Decimal('0.5'), dum.to_bits('0.5 b'))
+        self.assertEqual(-2000000, dum.to_bits('-2-Mb/sec'))
+        self.assertEqual(96, dum.to_bits('12'))
+        self.assertEqual(12, dum.to_bits('12', default_unit='b'))
+        self.assertEqual(80, dum.to_bits(10))
+        self.assertEqual(8000, dum.to_bits('1e3'))
+        self.assertIsInstance(dum.to_bits('1.0 KB'), int)
+
+    def test_to_bytes(self):
+        self.assertEqual(1500, data_units.to_bytes('1.5 KB'))
+        self.assertEqual(2 ** 80, data_units.to_bytes('1 YiB'))
+        self.assertEqual(Decimal('0.375'), data_units.to_bytes('3 b'))
+        self.assertEqual(Decimal('0.0625'), data_units.to_bytes('0.5 b'))
+
+    def test_many(self):
+        self.assertEqual([8000, 1, 16], data_units.to_bits_many(['1 KB', '1 b', 2]))
+        self.assertEqual([1000, Decimal('0.125'), 2], data_units.to_bytes_many(['1 KB', '1 b', 2]))
+
+    def test_unknown_unit(self):
+        dum = DataUnitManager(parse_method='loose_unit')
+
+        with self.assertRaises(AttributeError):
+            dum.to_bits('5 xyz')
+        with self.assertRaises(AttributeError):
+            data_units.to_bits('5 xyz')
+
+
+class TestCompound(unittest.TestCase):
+
+    def test_compound(self):
+        self.assertEqual(8 * (10 ** 9 + 512 * 10 ** 6), data_units.compound_to_bits('1 GB 512 MB'))
+        self.assertEqual(8 * (10 ** 9 + 512 * 10 ** 6), data_units.compound_to_bits('1GB+512MB'))
+        self.assertEqual(8 * 1024 + 4, data_units.compound_to_bits('1 KiB + 4 b'))
+        self.assertEqual(8 * 1000 - 8, data_units.compound_to_bits('1 KB -1 B'))
+        self.assertEqual(Decimal('8000.5'), data_units.compound_to_bits('1KB.5b'))
+        self.assertEqual(96, data_units.compound_to_bits('12'))
+
+    def test_non_specific(self):
+        dum = DataUnitManager(unitset=BIN_BYT, force_non_specific=True)
+
+        self.assertEqual(8 * (2 ** 30 + 512 * 2 ** 20), dum.compound_to_bits('1G+512M'))
+
+    def test_many(self):
+        self.assertEqual([12096, 96], data_units.compound_to_bits_many(['1 KB 512 B', '12']))
+
+    def test_bad_part(self):
+        with self.assertRaises(AttributeError):
+            data_units.compound_to_bits('1 GB 512 XB')
+        with self.assertRaises(AttributeError):
+            data_units.compound_to_bits('1 GB +')
+
+    def test_not_a_string(self):
+        self.assertEqual(96, data_units.compound_to_bits(12))
+        self.assertEqual(12, data_units.compound_to_bits(Decimal('1.5')))
+        self.assertEqual(4, data_units.compound_to_bits(4, default_unit='b'))
+        with self.assertRaises(AttributeError):
+            data_units.compound_to_bits(None)
+        with self.assertRaises(AttributeError):
+            data_units.compound_to_bits(['1 KB'])
+
+
+class TestParseListing(unittest.TestCase):
+
+    def test_du(self):
+        cols = data_units.parse_listing('4.0K\t./docs\n1.5M\t./src\n512\t./README\n2G\t.\n')
+
+        self.assertTrue(cols.exact)
+        self.assertEqual([32768, 12582912, 4096, 17179869184], cols.bits)
+        self.assertEqual([(32768, 'KiB', None), (12582912, 'MiB', None), (4096, 'B', None),
+                          (17179869184, 'GiB', None)], list(cols))
+
+    def test_ls_column(self):
+        lines = ['total 12K',
+                 '-rw-r--r-- 1 dan dan 1.1K Jan  1 12:00 a.txt',
+                 '-rw-r--r-- 1 dan dan  300 Jan  1 12:00 b.txt']
+
+        with self.assertRaises(AttributeError):
+            data_units.parse_listing(lines, column=4)
+
+        cols = data_units.parse_listing(iter(lines), column=4, skip_invalid=True)
+        self.assertFalse(cols.exact)
+        self.assertEqual([(Decimal('9011.2'), 'KiB', None), (Decimal('2400'), 'B', None)], list(cols))
+
+    def test_df_header_and_si(self):
+        text = ('Filesystem      Size  Used Avail Use% Mounted on\n'
+                '/dev/sda1        20G  5.5G   15G  28% /\n'
+                'tmpfs           3.9k     0  3.9k   0% /dev/shm\n')
+
+        cols = data_units.parse_listing(text, column=1, unitset=DEC_BYT, skip_invalid=True)
+        self.assertEqual([(160000000000, 'GB', None), (31200, 'KB', None)], list(cols))
+
+    def test_other_units(self):
+        cols = data_units.parse_listing(['1.5GiB x', '2meg y', '3 z'], default_unit='KiB')
+        self.assertEqual(['GiB', 'MiB', 'KiB'], [row[1] for row in cols])
+        self.assertEqual([12884901888, 16777216, 24576], cols.bits)
+
+    def test_matches_parse_many(self):
+        dum = DataUnitManager(unitset=BIN_BYT, force_non_specific=True)
+        tokens = ['4.0K', '1.2G', '512', '0.5', '.5M', '10T', '3gig', '1k', '7b']
+
+        self.assertEqual(list(dum.parse_many(tokens)), list(data_units.parse_listing(tokens)))
+
+    def test_bad_unitset(self):
+        with self.assertRaises(AttributeError):
+            data_units.parse_listing(['1K'], unitset='foo')
+
+
+class TestStream(unittest.TestCase):
+
+    def test_detects_unitset(self):
+        stream = data_units.stream(['1.5 MiB', '20 K', '3 meg', '7 b', '2 MB', '4 GiB'])
+
+        self.assertEqual(BIN_BYT, stream.unitset)
+        self.assertTrue(stream.detected)
+        self.assertEqual({DEC_BYT: 1, DEC_BIT: 0, BIN_BIT: 0, BIN_BYT: 2}, stream.votes)
+        self.assertEqual([(Decimal('1.5'), 'MiB', None), (Decimal('20'), 'KiB', None), (Decimal('3'), 'MiB', None),
+                          (Decimal('7'), 'b', None), (Decimal('2'), 'MB', None), (Decimal('4'), 'GiB', None)],
+                         list(stream))
+
+    def test_majority_and_ties(self):
+        self.assertEqual(DEC_BIT, data_units.stream(['1 MB', '2 Mb', '3 Kb', '4 K']).unitset)
+        self.assertEqual(DEC_BYT, data_units.stream(['1 MB', '2 Mb', '4 K']).unitset)
+        self.assertEqual(DEC_BIT, data_units.stream(['1 b', '4 K']).unitset)
+        self.assertEqual(DEC_BYT, data_units.stream(['4 K', '5', 'foo']).unitset)
+
+    def test_sample_size(self):
+        values = ['1 K', '2 KiB', '3 Kib', '4 Kib']
+
+        stream = data_units.stream(iter(values), sample_size=2)
+        self.assertEqual(BIN_BYT, stream.unitset)
+        self.assertEqual(['KiB', 'KiB', 'Kib', 'Kib'], [row[1] for row in stream])
+
+        self.assertEqual(BIN_BIT, data_units.stream(values).unitset)
+
+    def test_manager_unitset(self):
+        dum = DataUnitManager(unitset=BIN_BIT, force_non_specific=True)
+        stream = dum.stream(['1 Mib', '3 G'])
+
+        self.assertEqual(BIN_BIT, stream.unitset)
+        self.assertFalse(stream.detected)
+        self.assertEqual([(Decimal('1'), 'Mib', None), (Decimal('3'), 'Gib', None)], list(stream))
+
+    def test_suffixes_after_shared_table(self):
+        # the first stream shares a table for BIN_BYT without suffixes, the second one must not pick it up.
+        self.assertEqual([(Decimal('1'), 'MiB', None), (Decimal('2'), 'GiB', None)],
+                         list(data_units.stream(['1 MiB', '2 gig'])))
+        self.assertEqual([(Decimal('1'), 'MiB', None), (Decimal('2'), 'GiB', '/s')],
+                         list(DataUnitManager(suffix_sets=SUFFIX_SETS).stream(['1 MiB', '2 gig/sec'])))
+
+    def test_non_specific_unitset(self):
+        dum = DataUnitManager(non_specific_unitset=BIN_BYT, suffix_sets=SUFFIX_SETS)
+
+        self.assertEqual((Decimal('2'), 'GiB', '/s'), dum('2 gig/sec'))
+        self.assertEqual((Decimal('2'), 'MB', None), dum('2 MB'))
+        self.assertEqual((Decimal('2'), 'b', None), dum('2 b'))
+        self.assertIn('K', dum)
+
+        with self.assertRaises(AttributeError):
+            DataUnitManager(non_specific_unitset='foo')
+
+
+DE_CONV = {'decimal_point': ',', 'thousands_sep': '.', 'grouping': [3, 3, 0]}
+EN_CONV = {'decimal_point': '.', 'thousands_sep': ',', 'grouping': [3, 3, 0]}
+
+
+class TestNumberScanner(unittest.TestCase):
+
+    def test_split(self):
+        scanner = NumberScanner.from_localeconv(DE_CONV)
+
+        self.assertEqual(('1048576.5', 'KB'), scanner.split('1.048.576,5 KB'))
+        self.assertEqual(('1048', 'KB'), scanner.split('1.048 KB'))
+        self.assertEqual(('-1048.5', 'KB/s'), scanner.split('-1048,5KB/s'))
+        self.assertEqual(('.5', ''), scanner.split(',5'))
+        self.assertIsNone(scanner.split('1.04 KB'))
+        self.assertIsNone(scanner.split('1.5 KB'))
+        self.assertIsNone(scanner.split('KB'))
+
+    def test_grouping(self):
+        indian = NumberScanner('.', ',', [3, 2, 0])
+        self.assertEqual(('1234567.5', 'KB'), indian.split('12,34,567.5 KB'))
+        self.assertIsNone(indian.split('1,234,567'))
+
+        no_repeat = NumberScanner('.', ',', [3, locale.CHAR_MAX])
+        self.assertEqual(('123456789', ''), no_repeat.split('123456,789'))
+        self.assertIsNone(no_repeat.split('1,234,567'))
+
+        not_grouped = NumberScanner('.', '', [])
+        self.assertEqual(('1234.5', 'KB'), not_grouped.split('1234.5 KB'))
+        self.assertEqual(('1', ',234 KB'), not_grouped.split('1,234 KB'))
+
+    def test_get_number_scanner(self):
+        scanner = get_number_scanner(DE_CONV)
+
+        self.assertIs(scanner, get_number_scanner(dict(DE_CONV)))
+        self.assertIs(scanner, get_number_scanner(scanner))
+        self.assertEqual('.', get_number_scanner('C').decimal_point)
+        with self.assertRaises(AttributeError):
+            get_number_scanner('xx_XX.not-a-locale')
+
+    def test_locale_not_changed(self):
+        tmp_numeric = locale.setlocale(locale.LC_NUMERIC)
+        get_number_scanner('C')
+        self.assertEqual(tmp_numeric, locale.setlocale(locale.LC_NUMERIC))
+
+        # only a locale name the first time it is used switches the locale.
+        with mock.patch('locale.setlocale', side_effect=AssertionError('setlocale called')):
+            get_number_scanner('C')
+            get_number_scanner({'decimal_point': ',', 'thousands_sep': ' ', 'grouping': [3, 0]})
+            DataUnitManager(use_locale=DE_CONV)
+
+
+class TestUseLocale(unittest.TestCase):
+
+    def test_parse(self):
+        dum = DataUnitManager(use_locale=DE_CONV, suffix_sets=SUFFIX_SETS)
+
+        self.assertEqual((Decimal('1048576.5'), 'KB', '/s'), dum('1.048.576,5 KB/sec'))
+        self.assertEqual((Decimal('1024'), 'MB', None), dum(b'1.024 MB'))
+        self.assertEqual(12000, dum.to_bits('1,5 KB'))
+        self.assertEqual(ParseFailure.BAD_NUMBER, dum.try_parse('1.5 KB').code)
+        with self.assertRaises(AttributeError):
+            dum('1.5 KB')
+
+    def test_bulk(self):
+        dum = DataUnitManager(use_locale=EN_CONV)
+
+        self.assertEqual([8192, 16000], dum.parse_many(['1,024 B', '2 KB']).bits)
+        self.assertEqual([8396800, 8196], dum.parse_listing(['1,025K  ./a', '1,024.5  ./b']).bits)
+
+    def test_change_locale(self):
+        dum = DataUnitManager()
+        self.assertEqual((Decimal('1.5'), 'KB', None), dum('1.5 KB'))
+
+        dum.use_locale = DE_CONV
+        self.assertEqual((Decimal('1.5'), 'KB', None), dum('1,5 KB'))
+
+        dum.configure(use_locale=None)
+        self.assertEqual((Decimal('1.5'), 'KB', None), dum('1.5 KB'))
+
+
+class TestIncremental(unittest.TestCase):
+
+    text = 'sent 1.5 GiB/s, received 512 KiB in 3 secs\nthen 2 megabytes per second and 10 Kb\n'
+
+    def feed_all(self, dum, chunks):
+        feed = dum.incremental()
+        tmp_ret = []
+        for chunk in chunks:
+            tmp_ret.extend(feed.feed(chunk))
+        tmp_ret.extend(feed.close())
+        return tmp_ret
+
+    def test_matches_finditer(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS)
+        expected = list(dum.finditer(self.text))
+        self.assertEqual(4, len(expected))
+
+        for size in (1, 2, 3, 7, 64):
+            with self.subTest(size=size):
+                chunks = [self.text[i:i + size] for i in range(0, len(self.text), size)]
+                self.assertEqual(expected, self.feed_all(dum, chunks))
+
+    def test_split_token(self):
+        feed = data_units.incremental()
+
+        self.assertEqual([], feed.feed('sent 1.5 Gi'))
+        self.assertEqual([(5, Decimal('1.5'), 'GiB', None)], feed.feed('B, and 2 M'))
+        self.assertEqual([], feed.feed('B'))
+        self.assertEqual([(18, Decimal('2'), 'MB', None)], feed.close())
+
+    def test_bytes(self):
+        chunks = [b'got 1', b'0 KB ', b'\xff 5 b']
+        self.assertEqual([(4, Decimal('10'), 'KB', None), (12, Decimal('5'), 'b', None)],
+                         self.feed_all(data_units, chunks))
+
+    def test_grouped_number(self):
+        text = 'sent 1,234,567 bytes, received 1, 2 KB'
+        expected = [(34, Decimal('2'), 'KB', None)]
+        self.assertEqual(expected, list(data_units.finditer(text)))
+
+        for size in (1, 2, 3, 7, 64):
+            with self.subTest(size=size):
+                chunks = [text[i:i + size] for i in range(0, len(text), size)]
+                self.assertEqual(expected, self.feed_all(data_units, chunks))
+
+    def test_long_number(self):
+        number = '1234567890' * 10 + '.' + '5' * 100
+        text = 'sent %s KB/s' % number
+        expected = [(5, Decimal(number), 'KB', None)]
+        self.assertEqual(expected, list(data_units.finditer(text)))
+
+        for size in (1, 7, 64, 150):
+            with self.subTest(size=size):
+                chunks = [text[i:i + size] for i in range(0, len(text), size)]
+                self.assertEqual(expected, self.feed_all(data_units, chunks))
+
+    def test_carry_is_bounded(self):
+        feed = data_units.incremental()
+        for i in range(1000):
+            feed.feed('xxxxxxxx 1 KB yyyyyyyy ')
+            self.assertLessEqual(len(feed._carry), feed._settled + 4)
+
+        # only the last of a column of plain numbers is kept.
+        feed = data_units.incremental()
+        for i in range(1000):
+            feed.feed('12 345 6789 ')
+            self.assertLessEqual(len(feed._carry), feed._settled + 7)
+
+    def test_closed(self):
+        feed = data_units.incremental()
+        feed.close()
+        with self.assertRaises(AttributeError):
+            feed.feed('1 KB')
+
+
+class TestCompileFormat(unittest.TestCase):
+
+    def setUp(self):
+        self.dum = DataUnitManager(suffix_sets=SUFFIX_SETS)
+
+    def test_fixed_unit(self):
+        fmt = self.dum.compile_format('<int> KiB')
+
+        self.assertEqual((Decimal('512'), 'KiB', None), fmt('512 KiB'))
+        self.assertEqual((Decimal('-3'), 'KiB', None), fmt('-3 KiB'))
+        self.assertIsNone(fmt.units)
+
+    def test_unit_set(self):
+        fmt = self.dum.compile_format('<float><unit>/s', units=['KB', 'MB', 'foo'])
+
+        self.assertEqual(['KB', 'MB'], fmt.units)
+        self.assertEqual((Decimal('1.5'), 'MB', '/s'), fmt('1.5MB/s'))
+        self.assertEqual((Decimal('0.5'), 'KB', '/s'), fmt('.5KB/s'))
+
+    def test_fallback(self):
+        fmt = self.dum.compile_format('<int> KiB')
+
+        self.assertEqual((Decimal('1.5'), 'GB', '/s'), fmt('1.5 gigabytes per sec'))
+        self.assertEqual((5, 'B', None), fmt(5))
+        with self.assertRaises(AttributeError):
+            fmt('5 foo')
+
+    def test_matches_manager(self):
+        values = ['5 KiB', '5 kib', '5KiB', '-5 KiB', '1.5 KiB', '5 KiB/s', '5 megabytes', '007 KiB', '1e3 KiB', '5 KB',
+                  '5 MegaBytes', '2 gigabits per second', '.5 KB']
+        for spec in ('<int> KiB', '<float> <unit>', '<float> <unit>/s', '<int>'):
+            fmt = self.dum.compile_format(spec)
+            for value in values:
+                with self.subTest(spec=spec, value=value):
+                    try:
+                        expected = self.dum(value)
+                    except AttributeError:
+                        with self.assertRaises(AttributeError):
+                            fmt(value)
+                    else:
+                        self.assertEqual(expected, fmt(value))
+
+    def test_samples(self):
+        fmt = self.dum.compile_format(samples=['10 KiB', '512 KiB', '3 MiB'])
+        self.assertEqual('<int> <unit>', fmt.spec)
+        self.assertEqual(['KiB', 'MiB'], fmt.units)
+
+        fmt = self.dum.compile_format(samples=['1.5 MB/s', '2 MB/s', '7 MB per sec'])
+        self.assertEqual('<float> MB/s', fmt.spec)
+        self.assertEqual((Decimal('3.25'), 'MB', '/s'), fmt('3.25 MB/s'))
+
+        with self.assertRaises(AttributeError):
+            self.dum.compile_format(samples=['5 foo'])
+
+    def test_bad_spec(self):
+        for spec in ('KiB', '<int> foo', '<int> KB/xx'):
+            with self.subTest(spec=spec):
+                with self.assertRaises(AttributeError):
+                    self.dum.compile_format(spec)
+        with self.assertRaises(AttributeError):
+            self.dum.compile_format()
+
+
+class TestBuffers(unittest.TestCase):
+
+    def test_buffer_types(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0])
+        for value in test_parse_values:
+            try:
+                expected = dum(value)
+            except AttributeError:
+                expected = AttributeError
+
+            for buffer_type in (bytes, bytearray, memoryview):
+                try:
+                    returned = dum(buffer_type(value.encode('ascii')))
+                except AttributeError:
+                    returned = AttributeError
+
+                with self.subTest(m='%s(%r)' % (buffer_type.__name__, value)):
+                    self.assertEqual(expected, returned)
+
+    def test_offset_length(self):
+        buffer = memoryview(b'rx=1.5 GB/sec tx=12 KB')
+
+        self.assertEqual((Decimal('12'), 'KB', None), data_units.parse_buffer(buffer, offset=17))
+        self.assertEqual((Decimal('1.5'), 'GB', '/s'),
+                         DataUnitManager(suffix_sets=SUFFIX_SETS[0]).parse_buffer(buffer, offset=3, length=10))
+        self.assertEqual((Decimal('1E+3'), 'B', None), data_units.parse_buffer(b'x1e3x', 1, 3))
+        self.assertEqual(12000, data_units.to_bits(b'1.5 KB'))
+
+    def test_spans(self):
+        buffer = bytearray(b'1 KB|2 MiB|7')
+
+        self.assertEqual([(Decimal('1'), 'KB', None), (Decimal('2'), 'MiB', None), (Decimal('7'), 'Kb', None)],
+                         data_units.parse_spans(buffer, [(0, 4), (5, 5), (11, 1)], default_unit='Kb'))
+
+    def test_not_ascii(self):
+        with self.assertRaises(AttributeError):
+            data_units(b'\xff5 KB')
+
+
+class TestTryParse(unittest.TestCase):
+
+    def test_matches_call(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0])
+        for value in test_parse_values + ['', 'MB', 'five MB', '5 MB xx', '5 MB xx/s', 12]:
+            try:
+                expected = dum(value)
+            except (AttributeError, IndexError):
+                expected = None
+
+            returned = dum.try_parse(value)
+            with self.subTest(m=repr(value)):
+                if expected is None:
+                    self.assertIsInstance(returned, ParseFailure)
+                    self.assertFalse(returned)
+                else:
+                    self.assertEqual(expected, returned)
+
+    def test_codes(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0])
+
+        self.assertEqual(ParseFailure('five MB', ParseFailure.BAD_NUMBER), dum.try_parse('five MB'))
+        self.assertEqual(ParseFailure('', ParseFailure.BAD_NUMBER), dum.try_parse(''))
+        self.assertEqual(ParseFailure(None, ParseFailure.BAD_NUMBER), dum.try_parse(None))
+        self.assertEqual(ParseFailure('5 xyz', ParseFailure.UNKNOWN_UNIT), dum.try_parse('5 xyz'))
+        self.assertEqual(ParseFailure('5 MB/x', ParseFailure.UNKNOWN_SUFFIX), dum.try_parse('5 MB/x'))
+        self.assertEqual(ParseFailure('5 MB xx/s', ParseFailure.LEFTOVER_TEXT), dum.try_parse('5 MB xx/s'))
+
+    def test_early_rejection(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0])
+        calls = []
+        lookup_unit = dum._lookup_unit
+
+        def counting_lookup_unit(unit, **kwargs):
+            calls.append(unit)
+            return lookup_unit(unit, **kwargs)
+
+        dum._lookup_unit = counting_lookup_unit
+        dum.try_parse_many(['x MB', '5 xyz', '5 #MB'])
+        self.assertEqual([], calls)
+
+    def test_many(self):
+        self.assertEqual([(Decimal('1'), 'KB', None), ParseFailure('x', ParseFailure.BAD_NUMBER)],
+                         data_units.try_parse_many(['1 KB', 'x']))
+
+
+class TestUnitLookupCache(unittest.TestCase):
+
+    def test_bounded(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0], parse_method='loose_suffix', allow_caching=10)
+
+        for i in range(50):
+            dum._parse_unit('MB junk%s' % i)
+
+        info = dum.cache_info()
+        self.assertEqual(10, info.maxsize)
+        self.assertEqual(10, info.currsize)
+        self.assertEqual(40, info.evictions)
+        self.assertEqual(50, info.misses)
+
+        dum._parse_unit('MB junk49')
+        self.assertEqual(1, dum.cache_info().hits)
+
+    def test_tuple_keys(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0])
+        dum._parse_unit('MB/sec', default_unit='Kb')
+
+        self.assertIn(('MB/sec', 'Kb', None), dum._unit_lookup_cache)
+
+    def test_suffix_units_cached(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS)
+
+        self.assertEqual((Decimal('1.5'), 'GB', '/s'), dum('1.5 gigabytes/sec'))
+        self.assertEqual((Decimal('2'), 'GB', '/s'), dum('2 gigabytes/sec'))
+        self.assertEqual((Decimal('2'), 'GB', '/s'), dum('2 gigabytes/sec', unit_only=False))
+        self.assertEqual((None, 'GB', '/s'), dum('gigabytes/sec', unit_only=True))
+        self.assertEqual(3, dum.cache_info().hits)
+        self.assertEqual((Decimal('2'), 'KB', '/x'), dum('2', default_unit='KB', default_suffix='/x'))
+        self.assertEqual((Decimal('2'), 'GB', '/x'), dum('2 gigabytes', default_suffix='/x'))
+        self.assertEqual((Decimal('2'), 'GB', '/s'), dum('2 gigabytes/sec', default_suffix='/x'))
+
+    def test_caching_off(self):
+        dum = DataUnitManager(allow_caching=False)
+
+        self.assertEqual(('MB', None), dum._parse_unit('mB'))
+        self.assertEqual(0, dum.cache_info().maxsize)
+
+
+class TestMemo(unittest.TestCase):
+
+    def test_memo(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0], memoize=2)
+
+        for value in ['4 KB', '4 KB', '1 GB/s', '4 KB', '1 GB/sec', '2 b']:
+            self.assertEqual(DataUnitManager(suffix_sets=SUFFIX_SETS[0])(value), dum(value))
+
+        self.assertEqual((2, 4, 2, 2, 2), tuple(dum.memo_info()))
+        self.assertEqual(0, dum.cache_info().hits)
+
+    def test_memo_keys(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0], memoize=True)
+
+        self.assertEqual((Decimal('4'), 'B', None), dum('4'))
+        self.assertEqual((Decimal('4'), 'KB', '/x'), dum('4', default_unit='KB', default_suffix='/x'))
+        self.assertEqual((None, 'KB', None), dum('kilobyte', unit_only=True))
+        dum.default_unit = 'b'
+        self.assertEqual((Decimal('4'), 'b', None), dum('4'))
+        self.assertEqual(4, dum(4)[0])
+        self.assertEqual(4, dum.memo_info().currsize)
+
+    def test_memo_cleared(self):
+        dum = DataUnitManager(memoize=True)
+        dum('4 GB')
+        dum.unitset = BIN_BYT
+
+        self.assertEqual(0, dum.memo_info().currsize)
+        self.assertEqual(0, data_units.memo_info().maxsize)
+
+
+class TestAliasTables(unittest.TestCase):
+
+    def test_shared_tables(self):
+        dum_1 = DataUnitManager(unitset=BIN_BYT, force_non_specific=True, suffix_sets=SUFFIX_SETS[0])
+        dum_2 = DataUnitManager(unitset=BIN_BYT, force_non_specific=True, suffix_sets=SUFFIX_SETS[0],
+                                parse_method='loose_suffix')
+        dum_3 = DataUnitManager(unitset=BIN_BYT, force_non_specific=True)
+
+        self.assertIs(dum_1._alias_table, dum_2._alias_table)
+        self.assertEqual(dum_1.items(), dum_2.items())
+        self.assertIsNot(dum_1._alias_table, dum_3._alias_table)
+
+    def test_items_not_shared(self):
+        dum_1 = DataUnitManager(unitset=DEC_BIT)
+        dum_2 = DataUnitManager(unitset=DEC_BIT)
+
+        tmp_items = dum_1.items()
+        tmp_items['MB'] = 'Kb'
+        tmp_items['foo'] = 'Kb'
+        del tmp_items['Kb']
+
+        self.assertIsNot(dum_1.items(), dum_2.items())
+        self.assertEqual(dum_1.items(), dum_2.items())
+        self.assertNotIn('foo', dum_2.items())
+        self.assertEqual(('Kb', None), dum_2._parse_unit('Kb'))
+        with self.assertRaises(AttributeError):
+            dum_2._parse_unit('foo')
+
+    def test_shared_table_contents(self):
+        dum = DataUnitManager(unitset=DEC_BIT)
+        dum_fresh = AliasTable(unitset=DEC_BIT)
+
+        self.assertDictEqual(dum_fresh.lookup.items(), dum.items())
+        self.assertEqual(('Kb', None), dum._parse_unit('kilobits'))
+
+
+class TestLazyAliases(unittest.TestCase):
+
+    def setUp(self):
+        # the tests clear the shared tables, the other managers keep theirs.
+        self.registry = dict(AliasTable._registry)
+
+    def tearDown(self):
+        AliasTable._registry.clear()
+        AliasTable._registry.update(self.registry)
+
+    def test_not_built_until_used(self):
+        AliasTable.clear_registry()
+        dum = DataUnitManager(unitset=DEC_BIT, suffix_sets=SUFFIX_SETS[0])
+
+        self.assertNotIn('_alias_table', dum.__dict__)
+        self.assertEqual(('Mb', None), dum._parse_unit('Mb'))
+        self.assertIn('_alias_table', dum.__dict__)
+
+    def test_shared_table_set_at_init(self):
+        data_units('1 KB')
+        dum = DataUnitManager()
+
+        for name in DataUnitManager._alias_attrs:
+            with self.subTest(name=name):
+                self.assertIn(name, dum.__dict__)
+        self.assertIs(data_units._alias_table, dum._alias_table)
+
+    def test_getattr_only_once(self):
+        AliasTable.clear_registry()
+        dum = DataUnitManager(unitset=BIN_BYT)
+        calls = []
+        make_alias_list = dum._make_alias_list
+
+        def counting_make_alias_list():
+            calls.append(1)
+            make_alias_list()
+
+        dum._make_alias_list = counting_make_alias_list
+        for value in ('1 KiB', '2', '3 mebibytes', '4 MiB'):
+            dum(value)
+            dum.try_parse(value)
+
+        self.assertEqual(1, len(calls))
+
+    def test_option_change_drops_aliases(self):
+        dum = DataUnitManager()
+        self.assertEqual((Decimal('1'), 'GB', None), dum('1 gigabyte'))
+        tmp_table = dum._alias_table
+
+        dum.unitset = BIN_BYT
+        self.assertIsNot(tmp_table, dum.__dict__.get('_alias_table'))
+
+        dum.force_non_specific = True
+        self.assertEqual((Decimal('1'), 'GiB', None), dum('1 gig'))
+
+    def test_unknown_attribute(self):
+        with self.assertRaises(AttributeError):
+            junk = DataUnitManager().foo
+
+    def test_options_checked_when_set(self):
+        with self.assertRaisesRegex(AttributeError, 'Long names must be enabled'):
+            DataUnitManager(allow_long_names=False)
+        with self.assertRaises(AttributeError):
+            DataUnitManager(force_to_unitset=True)
+
+        dum = DataUnitManager()
+        with self.assertRaisesRegex(AttributeError, 'Long names must be enabled'):
+            dum.allow_long_names = False
+        with self.assertRaisesRegex(AttributeError, 'Long names must be enabled'):
+            dum.configure(allow_long_names=False)
+        with self.assertRaises(AttributeError):
+            dum.force_non_specific = True
+        self.assertTrue(dum.allow_long_names)
+        self.assertFalse(dum.force_non_specific)
+
+        dum.configure(allow_long_names=False, allow_plural_names=False)
+        self.assertEqual((Decimal('1'), 'MB', None), dum('1 MB'))
+
+
+class TestConfigure(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = dict(AliasTable._registry)
+
+    def tearDown(self):
+        AliasTable._registry.clear()
+        AliasTable._registry.update(self.registry)
+
+    def test_configure_rebuilds_once(self):
+        AliasTable.clear_registry()
+        dum = DataUnitManager()
+        calls = []
+        make_alias_list = dum._make_alias_list
+
+        def counting_make_alias_list():
+            calls.append(1)
+            make_alias_list()
+
+        dum._make_alias_list = counting_make_alias_list
+        dum.configure(unitset=BIN_BYT, force_non_specific=True, force_to_unitset=True,
+                      allow_long_names=False, allow_plural_names=False, suffixes=SUFFIX_SETS)
+
+        self.assertEqual(0, len(calls))
+        self.assertEqual((Decimal('2'), 'GiB', '/s'), dum('2 G/sec'))
+        self.assertNotIn('gigabyte', dum)
+        self.assertEqual(1, len(calls))
+
+    def test_configure_validates(self):
+        dum = DataUnitManager()
+
+        with self.assertRaises(AttributeError):
+            dum.configure(force_non_specific=True)
+        with self.assertRaises(AttributeError):
+            dum.configure(parse_method='blah')
+        with self.assertRaises(AttributeError):
+            dum.configure(foo=True)
+
+        self.assertIsNone(dum.unitset)
+        self.assertFalse(dum.force_non_specific)
+
+    def test_configure_clears_cache(self):
+        dum = DataUnitManager(unitset=DEC_BYT, force_non_specific=True, suffix_sets=SUFFIX_SETS)
+        self.assertEqual(('GB', '/s'), dum._parse_unit('G/sec'))
+        self.assertEqual(1, dum.cache_info().currsize)
+
+        dum.configure(unitset=BIN_BYT)
+        self.assertEqual(0, dum.cache_info().currsize)
+        self.assertEqual((Decimal('2'), 'GiB', '/s'), dum('2 G/sec'))
+
+    def test_suffix_lists(self):
+        dum = DataUnitManager(suffix_sets=[{'/s': ['/sec', 'ps']}, {'/m': '/min'}])
+
+        self.assertDictEqual({'/sec': '/s', 'ps': '/s', '/min': '/m'}, dum.suffixes)
+
+
+class TestFindIter(unittest.TestCase):
+
+    def test_text(self):
+        self.assertEqual([(5, Decimal('1.23'), 'GB', None), (23, Decimal('512'), 'KiB', None)],
+                         list(data_units.finditer('sent 1.23 GB, received 512 KiB')))
+
+    def test_lines(self):
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS)
+        lines = ['rate 5 MB/sec and 3Mbps\n', 'v2.5MB 10-20 MB x5Mbx 7 megabytes\n']
+
+        self.assertEqual([(5, Decimal('5'), 'MB', '/s'),
+                          (18, Decimal('3'), 'Mb', '/s'),
+                          (34, Decimal('20'), 'MB', None),
+                          (46, Decimal('7'), 'MB', None)], list(dum.finditer(iter(lines))))
+
+    def test_nothing_found(self):
+        self.assertEqual([], list(data_units.finditer(['no sizes here', 'or 12 here'])))
+
+    def test_grouped_number(self):
+        # the end of a digit grouped number is not a size on its own.
+        self.assertEqual([(34, Decimal('2'), 'KB', None)],
+                         list(data_units.finditer('sent 1,234,567 bytes, received 1, 2 KB')))
+
+
+class TestParseValue(unittest.TestCase):
+
+    def test_matches_generic(self):
+        for value in test_parse_values + ['4096', ' 12', '1.2.3 MB', '1_000 KB', '1e3 KB', '\u0661\u0662', '\u00b2 KB',
+                                          12, 1.5, Decimal('2')]:
+            try:
+                expected = data_units._parse_value_generic(value)
+            except AttributeError:
+                expected = AttributeError
+
+            try:
+                returned = data_units._parse_value(value)
+            except AttributeError:
+                returned = AttributeError
+
+            with self.subTest(m=repr(value)):
+                self.assertEqual(expected, returned)
+
+    def test_non_ascii_digits(self):
+        self.assertTrue(is_ascii_digits('4096'))
+        self.assertFalse(is_ascii_digits('\u0661\u0662'))
+        self.assertFalse(is_ascii_digits('\u00b2'))
+        self.assertFalse(is_ascii_digits(''))
+
+        # the plain number fast path is only for 0-9, other digits take the full parse.
+        self.assertEqual((Decimal('12'), 'B', None), data_units('\u0661\u0662'))
+        with self.assertRaises(AttributeError):
+            data_units('\u00b2')
+
+
+class TestThreads(unittest.TestCase):
+
+    def _run_threads(self, worker, count=8):
+        errors = []
+
+        def run(index):
+            try:
+                worker(index)
+            except Exception as err:
+                errors.append(err)
+
+        tmp_switch = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=run, args=(i,)) for i in range(count)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(tmp_switch)
+
+        self.assertEqual([], errors)
+
+    def test_shared_manager(self):
+        # small caches so the threads are evicting each other's entries.
+        dum = DataUnitManager(suffix_sets=SUFFIX_SETS[0], parse_method='loose_suffix', allow_caching=8, memoize=8)
+        dum_check = DataUnitManager(suffix_sets=SUFFIX_SETS[0], parse_method='loose_suffix', allow_caching=False)
+        values = ['%s %s' % (i, unit) for i, unit in enumerate(['MB junk', 'KiB/sec', 'gigabytes/s', 'b x', 'B'] * 20)]
+        expected = [dum_check(value) for value in values]
+        results = {}
+
+        def worker(index):
+            results[index] = [dum(value) for value in values[index:] + values[:index]]
+
+        self._run_threads(worker)
+
+        for index, returned in results.items():
+            self.assertEqual(expected[index:] + expected[:index], returned)
+
+    def test_shared_calculator(self):
+        calc = DataSizeCalculator()
+        units = list(calc._base_units)
+        expected = {(f, t): DataSizeCalculator().convert(3, f, t) for f in units for t in units}
+        results = {}
+
+        def worker(index):
+            results[index] = {(f, t): calc.convert(3, f, t) for f in units[index:] + units[:index] for t in units}
+
+        self._run_threads(worker)
+
+        for returned in results.values():
+            self.assertEqual(expected, returned)
+
+    def test_module_instances(self):
+        def worker(index):
+            for i in range(200):
+                value, unit, suffix = data_units('%s.5 MiB' % i)
+                data_size_calculator(value, unit, 'KB')
+
+        self._run_threads(worker)
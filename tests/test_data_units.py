@@ -319,6 +319,51 @@ class TestDataUnitManager(unittest.TestCase):
         self.assertNotIn('foo', dum)
 
 
+class TestAliasLookup(unittest.TestCase):
+
+    def test_matches_aliases(self):
+        for mangle_case in (True, False):
+            du = DataUnit('M', DEC_BYT)
+            tmp_exact, tmp_folded = du.alias_parts(long_name=True, mangle_case=mangle_case, plural=True)
+            lookup = AliasLookup(tmp_exact, tmp_folded, mangle_case=mangle_case)
+            full = du.aliases(long_name=True, mangle_case=mangle_case, plural=True)
+
+            for key in ('MB', 'mB', 'Mb', 'megabyte', 'Megabyte', 'MegaByte', 'megaByte', 'MEGABYTE', 'megabytes',
+                        'MegaBytes', 'mEgabyte', 'foo'):
+                with self.subTest(key=key, mangle_case=mangle_case):
+                    self.assertEqual(full.get(key), lookup.get(key))
+
+    def test_contains(self):
+        lookup = AliasLookup({'MB': 'MB'}, {'megabyte': 'MB'})
+
+        self.assertIn('MB', lookup)
+        self.assertIn('Megabyte', lookup)
+        self.assertNotIn('mb', lookup)
+        self.assertNotIn('MEGABYTE', lookup)
+        with self.assertRaises(KeyError):
+            junk = lookup['MEGABYTE']
+
+    def test_items_is_full_dict(self):
+        for mangle_case in (True, False):
+            du = DataUnit('M', DEC_BYT)
+            lookup = AliasLookup(*du.alias_parts(long_name=True, mangle_case=mangle_case, plural=True),
+                                 mangle_case=mangle_case)
+            full = du.aliases(long_name=True, mangle_case=mangle_case, plural=True)
+            with self.subTest(mangle_case=mangle_case):
+                self.assertDictEqual(full, lookup.items())
+                self.assertEqual(len(full), len(lookup))
+                # only the case sensitive and the lower case long names are kept, not the other casings.
+                self.assertEqual(['megabyte', 'megabytes'], sorted(lookup.folded))
+
+    def test_not_strings(self):
+        lookup = AliasLookup({'MB': 'MB'}, {'megabyte': 'MB'})
+
+        self.assertIsNone(lookup.get(None))
+        self.assertIsNone(lookup.get(1))
+        self.assertIsNone(lookup.get(['MB']))
+        self.assertIsNone(lookup.get(b'megabyte'))
+
+
 '''
 class TestDSC2(unittest.TestCase):
 
@@ -0,0 +1,73 @@
+import unittest
+import sys
+import threading
+from lru_cache import LRUCache, CacheInfo
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_get_set(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'] = 1
+
+        self.assertEqual(1, cache.get('a'))
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual('x', cache.get('b', 'x'))
+        self.assertEqual(CacheInfo(1, 2, 0, 2, 1), cache.cache_info())
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'] = 1
+        cache['b'] = 2
+        cache.get('a')
+        cache['c'] = 3
+
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertIn('c', cache)
+        self.assertEqual(1, cache.cache_info().evictions)
+        self.assertEqual(2, len(cache))
+
+    def test_clear(self):
+        cache = LRUCache(maxsize=2)
+        cache['a'] = 1
+        cache.clear()
+
+        self.assertEqual(0, len(cache))
+
+    def test_bad_size(self):
+        with self.assertRaises(AttributeError):
+            LRUCache(maxsize=0)
+
+
+class TestLRUCacheThreads(unittest.TestCase):
+
+    def test_shared_cache(self):
+        cache = LRUCache(maxsize=16)
+        errors = []
+
+        def worker(offset):
+            try:
+                for i in range(2000):
+                    key = (i + offset) % 40
+                    if cache.get(key) is None:
+                        cache[key] = key
+            except Exception as err:
+                errors.append(err)
+
+        tmp_switch = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(tmp_switch)
+
+        info = cache.cache_info()
+        self.assertEqual([], errors)
+        self.assertEqual(16, len(cache))
+        self.assertEqual(16000, info.hits + info.misses)
+        self.assertLessEqual(info.evictions, info.misses - 16)
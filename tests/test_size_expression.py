@@ -0,0 +1,67 @@
+import unittest
+from size_expression import SizeExpression, compile_expression, evaluate_expression
+from data_unit_calc import DataUnitManager
+from data_unit_lookups import *
+from decimal import Decimal
+
+
+class TestSizeExpression(unittest.TestCase):
+
+    def test_constant(self):
+        expr = compile_expression('3 * 2 TiB + 512 GiB - 5%')
+
+        self.assertEqual('size', expr.kind)
+        self.assertEqual(Decimal('6323.2'), expr(unit='GiB'))
+        self.assertEqual(Decimal('6323.2') * 8 * 2 ** 30, expr())
+
+    def test_precedence(self):
+        self.assertEqual(7000, evaluate_expression('1 KB + 2 KB * 3', unit='B'))
+        self.assertEqual(9000, evaluate_expression('(1 KB + 2 KB) * 3', unit='B'))
+        self.assertEqual(1000, evaluate_expression('-(1 KB) + 2KB', unit='B'))
+        self.assertEqual(8, evaluate_expression('1 B'))
+
+    def test_percent(self):
+        self.assertEqual(950, evaluate_expression('1 TB - 5%', unit='GB'))
+        self.assertEqual(1050, evaluate_expression('1 TB + 5%', unit='GB'))
+        self.assertEqual(50, evaluate_expression('1 TB * 5%', unit='GB'))
+        self.assertEqual(Decimal('0.05'), evaluate_expression('5%'))
+
+    def test_scalars(self):
+        self.assertEqual(4, evaluate_expression('1 TB / 250 GB'))
+        self.assertEqual('scalar', compile_expression('1 TB / 250 GB').kind)
+        self.assertEqual(Decimal('1.5'), evaluate_expression('1.5 b'))
+
+    def test_variables(self):
+        expr = compile_expression('(total - reserved) / 4 + 10%')
+
+        self.assertEqual(frozenset(['total', 'reserved']), expr.names)
+        self.assertEqual(Decimal('247.5'), expr(total=8000, reserved='100 B', unit='B'))
+        self.assertEqual(275, expr(total='1 KB', reserved=0, unit='B'))
+
+        with self.assertRaises(AttributeError):
+            expr(total=8000)
+
+    def test_cached(self):
+        self.assertIs(compile_expression('1 GB * 2'), compile_expression('1 GB * 2'))
+
+        dum = DataUnitManager(unitset=BIN_BYT, force_non_specific=True)
+        expr = compile_expression('1 G * 2', unit_manager=dum)
+        self.assertIsNot(expr, compile_expression('1 GB * 2'))
+        self.assertEqual(2, expr(unit='GiB'))
+
+    def test_errors(self):
+        for source in ['1 TB + 3', '3 / 1 TB', '1 TB * 1 GB', '(1 TB', '1 TB )', '1 TB $', '', '5% + 5%', '1 XB']:
+            with self.subTest(m=source):
+                with self.assertRaises(AttributeError):
+                    SizeExpression(source)
+
+    def test_divide_by_zero(self):
+        for source in ['1 TB / 0', '1 TB / (2 - 2)', '1 TB / 0 GB']:
+            with self.subTest(m=source):
+                with self.assertRaisesRegex(AttributeError, 'divides by zero'):
+                    SizeExpression(source)
+
+        expr = compile_expression('total / used')
+        self.assertEqual(2, expr(total='2 KB', used='1 KB'))
+        with self.assertRaisesRegex(AttributeError, 'total / used divides by zero'):
+            expr(total='2 KB', used=0)
@@ -43,3 +43,15 @@ class TestStartsEndsWith(unittest.TestCase):
         sew = StartsEndsWith(prefixes=test_prefix_list, case_insensitive=True)
         self.assertEqual(('Megabyte', '/SeC'), sew('Megabyte/SeC'))
 
+
+    def test_longest_match_with_trie(self):
+        sew = StartsEndsWith(prefixes=['m', 'me', 'meg', 'megabyte'], suffixes=['s', '/s', 'ps'])
+        self.assertEqual(('meg', None, '/s'), sew('meg/s'))
+        self.assertEqual(('MeGaByTe', 'x', 'pS'), sew('MeGaByTexpS'))
+        self.assertEqual(('meg', 'ab', None), sew('megab'))
+
+    def test_non_ascii_term(self):
+        sew = StartsEndsWith(prefixes=test_prefix_list, suffixes=test_suffix_list)
+        self.assertEqual(('Kb', 'ä', '/s'), sew('Kbä/s'))
+        self.assertEqual((None, 'ämegabyte', None), sew('ämegabyte'))
+        self.assertEqual(('Kb', '\ud800', '/s'), sew('Kb\ud800/s'))